@@ -48,6 +48,10 @@ db: Optional[rewinddb.RewindDB] = None
 # Global system timezone (detected at startup)
 system_timezone: Optional[str] = None
 
+# Cap on audio word matches per search; each match also brings up to a minute
+# of context words, so an unbounded search over a long window can be huge
+_SEARCH_AUDIO_LIMIT = 500
+
 
 def detect_system_timezone() -> str:
     """Detect the system's local timezone."""
@@ -920,7 +924,7 @@ class MCPServer:
                     time_components["minutes"] / (24 * 60) +
                     time_components["seconds"] / (24 * 60 * 60)
                 )
-                results = db.search(keyword, days=days)
+                results = db.search(keyword, days=days, limit=_SEARCH_AUDIO_LIMIT)
             elif from_time and to_time:
                 # Search with absolute time range
                 audio_transcripts = db.get_audio_transcripts_absolute(from_time, to_time)
@@ -943,7 +947,7 @@ class MCPServer:
                 }
             else:
                 # Default to 7 days if no time range specified
-                results = db.search(keyword)
+                results = db.search(keyword, limit=_SEARCH_AUDIO_LIMIT)
 
             formatted = format_search_results(results)
 
@@ -952,6 +956,9 @@ class MCPServer:
 
             response_text = f"Search results for '{keyword}':\n"
             response_text += f"Found {audio_count} audio matches and {screen_count} screen matches\n\n"
+            if sum(1 for item in results['audio'] if item.get('is_match')) >= _SEARCH_AUDIO_LIMIT:
+                response_text += (f"Only the {_SEARCH_AUDIO_LIMIT} most recent audio word matches were kept; "
+                                  f"narrow the time range to see earlier ones\n\n")
 
             if formatted['audio']:
                 response_text += "Audio matches:\n"
@@ -1062,7 +1069,8 @@ class MCPServer:
                     time_components["minutes"] / (24 * 60) +
                     time_components["seconds"] / (24 * 60 * 60)
                 )
-                results = db.search(keyword, days=days)
+                # only screen results are used, so no audio matches are fetched
+                results = db.search(keyword, days=days, limit=0)
             elif from_time and to_time:
                 # Search with absolute time range
                 screen_ocr = db.get_screen_ocr_absolute(from_time, to_time)
@@ -1079,7 +1087,7 @@ class MCPServer:
                 }
             else:
                 # Default to 7 days if no time range specified
-                results = db.search(keyword)
+                results = db.search(keyword, limit=0)
 
             # Filter by application if specified
             if application and results.get('screen'):
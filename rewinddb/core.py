@@ -9,6 +9,8 @@ and searching across both data types.
 import os
 import time
 import datetime
+import functools
+import re
 import typing
 import logging
 try:
@@ -22,6 +24,90 @@ log_level = logging.INFO if os.environ.get('DEBUG') == '1' else logging.CRITICAL
 logging.basicConfig(level=log_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# indexes backing the hot joins and time-range filters. newer sqlite versions no
+# longer build automatic indexes on these columns, so without them every join
+# degrades to a nested full scan.
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_tw_segment_offset_word ON transcript_word(segmentId, timeOffset, word)",
+    # answers the largest word offset, which bounds the recording look-back
+    # of the transcript range queries, with one seek instead of a table scan
+    "CREATE INDEX IF NOT EXISTS idx_tw_offset ON transcript_word(timeOffset)",
+    "CREATE INDEX IF NOT EXISTS idx_node_frameid ON node(frameId)",
+    "CREATE INDEX IF NOT EXISTS idx_frame_segmentid ON frame(segmentId)",
+    # (createdAt, segmentId, imageFileName) covers the frame side of the ocr
+    # and screenshot range queries, so rows come back in createdAt order (or
+    # reverse order) straight from the index with no sort and no table lookup.
+    # it supersedes the createdAt and (createdAt, segmentId) indexes.
+    "CREATE INDEX IF NOT EXISTS idx_frame_createdat_segment_image ON frame(createdAt, segmentId, imageFileName)",
+    "DROP INDEX IF EXISTS idx_frame_createdat",
+    "DROP INDEX IF EXISTS idx_frame_createdat_segmentid",
+    "CREATE INDEX IF NOT EXISTS idx_audio_starttime ON audio(startTime)",
+    # lets a join that starts from transcript words (fts matches) check the
+    # recording's time range with one seek instead of scanning the range
+    "CREATE INDEX IF NOT EXISTS idx_audio_segment_start ON audio(segmentId, startTime)",
+    # (startDate, endDate, bundleID) covers the app usage aggregation, which
+    # reads nothing else from segment. it supersedes the (startDate, endDate) index.
+    "CREATE INDEX IF NOT EXISTS idx_segment_start_end_bundle ON segment(startDate, endDate, bundleID)",
+    "DROP INDEX IF EXISTS idx_segment_start_end",
+    "CREATE INDEX IF NOT EXISTS idx_event_start_end ON event(startDate, endDate)",
+)
+
+# the index name and, for created indexes, the table and columns of an
+# _INDEXES statement
+_INDEX_STATEMENT_RE = re.compile(r"INDEX IF (?:NOT )?EXISTS (\w+)(?: ON (\w+)\(([^)]*)\))?")
+
+# how long to wait for the write lock when there are indexes to create. rewind
+# writes continuously while recording, so waiting the full busy timeout would
+# stall every connection; the work is left to a later one instead
+_SCHEMA_BUSY_TIMEOUT_MS = 100
+
+# rows ANALYZE examines per index, which bounds how long it holds the write
+# lock on a large database
+_ANALYSIS_LIMIT = 1000
+
+# full-text index over transcript words. the trigram tokenizer keeps the
+# substring semantics of the old INSTR scan while answering from an inverted
+# index, but it can only match terms of at least three characters.
+_TRANSCRIPT_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transcript_word_fts USING fts5("
+    "word, content='transcript_word', content_rowid='id', tokenize='trigram')"
+)
+_FTS_MIN_TERM_LENGTH = 3
+
+# number of words indexed per write transaction, so the write lock is never
+# held for a whole build of the index
+_FTS_BATCH_SIZE = 50000
+
+# the index is not updated when the rewind app deletes or edits words, so the
+# (count, highest id, total length) of the indexed words is kept alongside it.
+# connecting only compares the highest id, which is one seek; comparing the
+# count and length reads every word and is left to verify_transcript_index
+_TRANSCRIPT_FTS_SYNC = (
+    "CREATE TABLE IF NOT EXISTS transcript_word_fts_sync ("
+    "id INTEGER PRIMARY KEY CHECK (id = 0), word_count INTEGER, max_id INTEGER, total_length REAL)"
+)
+
+_UTC = datetime.timezone.utc
+
+
+@functools.lru_cache(maxsize=8192)
+def _ms_to_datetime(ms: int) -> datetime.datetime:
+    """convert milliseconds since epoch to datetime object.
+
+    memoized, since many rows share a timestamp (frames of one capture, words
+    of one recording, event boundaries).
+
+    args:
+        ms: milliseconds since epoch
+
+    returns:
+        datetime object representing the timestamp in UTC
+    """
+
+    # Convert to UTC datetime to match the now() call in get_statistics
+    return datetime.datetime.fromtimestamp(ms / 1000, tz=_UTC)
+
+
 class RewindDB:
     """main class for interfacing with the rewind.ai sqlite database.
 
@@ -48,6 +134,17 @@ class RewindDB:
         if not os.path.exists(self.db_path):
             raise FileNotFoundError(f"rewind database not found at {self.db_path}")
 
+        # timestamp storage format per (table, column), probed lazily
+        self._text_timestamps = {}
+
+        # whether transcript_word_fts can be searched, set by _connect. words
+        # above the highest indexed id, recorded since, are scanned instead
+        self._transcript_fts = False
+        self._fts_indexed_id = 0
+
+        # (modification key, stats) from the last _get_database_stats call
+        self._db_stats_cache = None
+
         # connect to the database
         self._connect()
 
@@ -62,13 +159,23 @@ class RewindDB:
         try:
             # connect to the database using pysqlcipher3
             self.conn = sqlite3.connect(self.db_path)
+            # rows support both positional and column-name access
+            self.conn.row_factory = sqlite3.Row
             self.cursor = self.conn.cursor()
 
             # configure the connection for the encrypted database
-            # note: sqlcipher requires the key to be set before any other operations
-            self.cursor.execute(f"PRAGMA key = '{self.db_password}'")
+            # note: sqlcipher requires the key to be set before any other operations.
+            # pragmas can't take bound parameters, so quotes in the passphrase are
+            # escaped instead (a hex x'..' literal would be read as a raw key)
+            escaped_password = self.db_password.replace("'", "''")
+            self.cursor.execute(f"PRAGMA key = '{escaped_password}'")
             self.cursor.execute("PRAGMA cipher_compatibility = 4")  # ensure sqlcipher v4 compatibility
 
+            # keep sorts and temp b-trees in memory and give the page cache room
+            # (64 mb) for the repeated range scans
+            self.cursor.execute("PRAGMA temp_store = MEMORY")
+            self.cursor.execute("PRAGMA cache_size = -65536")
+
             # test the connection
             try:
                 logger.debug("testing database connection")
@@ -84,6 +191,299 @@ class RewindDB:
             logger.error(f"unexpected error connecting to database: {e}")
             raise ConnectionError(f"failed to connect to rewind database: {e}")
 
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        """bring the indexes and the transcript full-text index up to date.
+
+        what is missing is worked out with plain reads first, so a connection
+        with nothing to do never takes the write lock. when there is work, the
+        lock is only waited on briefly: the rewind app may be holding it, and
+        the work is then left to a later connection while queries fall back
+        to table scans.
+        """
+
+        try:
+            indexes_pending = self._indexes_pending()
+        except sqlite3.DatabaseError as e:
+            logger.debug(f"skipping index creation: {e}")
+            indexes_pending = False
+
+        try:
+            fts_action, indexed_id = self._transcript_fts_pending()
+            self._transcript_fts = fts_action != 'rebuild'
+            self._fts_indexed_id = indexed_id
+        except sqlite3.DatabaseError as e:
+            # fts5 or its trigram tokenizer may be missing from this sqlite build
+            logger.debug(f"transcript full-text index unavailable: {e}")
+            fts_action = None
+
+        if not indexes_pending and fts_action is None:
+            return
+
+        self.cursor.execute("PRAGMA busy_timeout")
+        busy_timeout = self.cursor.fetchone()[0]
+        self.cursor.execute(f"PRAGMA busy_timeout = {_SCHEMA_BUSY_TIMEOUT_MS}")
+        try:
+            if indexes_pending:
+                self._ensure_indexes()
+            if fts_action is not None:
+                self._transcript_fts = self._sync_transcript_fts(fts_action, indexed_id)
+        finally:
+            self.cursor.execute(f"PRAGMA busy_timeout = {int(busy_timeout)}")
+
+    def _indexes_pending(self) -> bool:
+        """check whether any of the indexes or the planner statistics are missing.
+
+        only reads the schema. indexes on tables or columns missing from
+        older databases (some have no event start and end dates) don't count
+        as missing, since they can never be created.
+
+        returns:
+            true if _ensure_indexes has something to do
+        """
+
+        self.cursor.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'index')")
+        tables = set()
+        indexes = set()
+        for kind, name in self.cursor.fetchall():
+            (tables if kind == 'table' else indexes).add(name)
+
+        for statement in _INDEXES:
+            match = _INDEX_STATEMENT_RE.search(statement)
+            name, table, columns = match.groups()
+            if table is None:
+                # a superseded index still waiting to be dropped
+                if name in indexes:
+                    return True
+            elif table in tables and name not in indexes:
+                self.cursor.execute(f"PRAGMA table_info({table})")
+                table_columns = {row[1] for row in self.cursor.fetchall()}
+                if all(column.strip() in table_columns for column in columns.split(',')):
+                    return True
+
+        return 'sqlite_stat1' not in tables
+
+    def _ensure_indexes(self) -> None:
+        """create the indexes used by the join and time-range queries.
+
+        the statements are idempotent and each is committed on its own, so
+        the write lock is only held for one index build at a time and the
+        rewind app can write in between. tables missing from older databases
+        are skipped. the planner statistics are gathered once, the first time
+        the indexes are created, from a sample of each index.
+        """
+
+        for statement in _INDEXES:
+            try:
+                self.cursor.execute("BEGIN IMMEDIATE")
+            except sqlite3.DatabaseError as e:
+                logger.debug(f"skipping index creation, database not writable: {e}")
+                return
+
+            try:
+                self.cursor.execute(statement)
+                self.conn.commit()
+            except sqlite3.DatabaseError as e:
+                logger.debug(f"skipping index ({statement}): {e}")
+                self.conn.rollback()
+
+        try:
+            self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'")
+            if self.cursor.fetchone() is None:
+                logger.info("analyzing database for the query planner")
+                self.cursor.execute(f"PRAGMA analysis_limit = {_ANALYSIS_LIMIT}")
+                self.cursor.execute("BEGIN IMMEDIATE")
+                self.cursor.execute("ANALYZE")
+                self.conn.commit()
+        except sqlite3.DatabaseError as e:
+            logger.debug(f"skipping planner statistics: {e}")
+            self.conn.rollback()
+
+    def _transcript_fts_pending(self) -> typing.Tuple[typing.Optional[str], int]:
+        """check what it takes to bring the transcript full-text index up to date.
+
+        only reads, and only the highest word id: a highest id below the
+        indexed one means words were deleted since and their ids may come
+        back. reading the index fails when fts5 is missing from this build.
+
+        returns:
+            tuple of (action, indexed id), where action is 'rebuild', 'append'
+            for words newer than the indexed id, or none when in sync
+        """
+
+        self.cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' "
+            "AND name IN ('transcript_word_fts', 'transcript_word_fts_sync')"
+        )
+        names = {row[0] for row in self.cursor.fetchall()}
+        if 'transcript_word_fts' not in names:
+            return 'rebuild', 0
+        self.cursor.execute("SELECT rowid FROM transcript_word_fts LIMIT 0")
+        if 'transcript_word_fts_sync' not in names:
+            return 'rebuild', 0
+
+        self.cursor.execute("SELECT max_id FROM transcript_word_fts_sync WHERE id = 0")
+        row = self.cursor.fetchone()
+        if row is None:
+            return 'rebuild', 0
+
+        indexed_id = row[0]
+        self.cursor.execute("SELECT MAX(id) FROM transcript_word")
+        max_id = self.cursor.fetchone()[0] or 0
+        if max_id < indexed_id:
+            return 'rebuild', 0
+        if max_id > indexed_id:
+            return 'append', indexed_id
+        return None, indexed_id
+
+    def _sync_transcript_fts(self, action: str, indexed_id: int) -> bool:
+        """create and sync the full-text index over transcript words.
+
+        the index is an external content fts5 table, so only the inverted index
+        is stored. words are indexed in batches of ids, each committed on its
+        own, so the rewind app is never kept from writing for long. the
+        progress is recorded with every batch, and an interrupted build carries
+        on from there on the next connection.
+
+        args:
+            action: 'rebuild' or 'append', as returned by _transcript_fts_pending
+            indexed_id: highest word id already indexed
+
+        returns:
+            true if the index can be searched, with the words above
+            _fts_indexed_id left to a scan
+        """
+
+        # an index that only lags behind is still right for the words it has
+        usable = action == 'append'
+        try:
+            self.cursor.execute("BEGIN IMMEDIATE")
+            self.cursor.execute(_TRANSCRIPT_FTS)
+            self.cursor.execute(_TRANSCRIPT_FTS_SYNC)
+            if action == 'rebuild':
+                logger.info("building the transcript full-text index")
+                self.cursor.execute("INSERT INTO transcript_word_fts(transcript_word_fts) VALUES('delete-all')")
+                self.cursor.execute("INSERT OR REPLACE INTO transcript_word_fts_sync VALUES (0, 0, 0, 0)")
+                indexed_id = 0
+            self.conn.commit()
+            usable = True
+            self._fts_indexed_id = indexed_id
+
+            while True:
+                self.cursor.execute("BEGIN IMMEDIATE")
+                self.cursor.execute("""
+                SELECT COUNT(*), MAX(id), TOTAL(LENGTH(word)) FROM (
+                    SELECT id, word FROM transcript_word WHERE id > ? ORDER BY id LIMIT ?
+                )
+                """, (indexed_id, _FTS_BATCH_SIZE))
+                batch_count, batch_max_id, batch_length = self.cursor.fetchone()
+                if not batch_count:
+                    self.conn.commit()
+                    return True
+
+                logger.info(f"indexing transcript words after id {indexed_id}")
+                self.cursor.execute("""
+                INSERT INTO transcript_word_fts(rowid, word)
+                SELECT id, word FROM transcript_word WHERE id > ? AND id <= ?
+                """, (indexed_id, batch_max_id))
+                self.cursor.execute("""
+                UPDATE transcript_word_fts_sync
+                SET word_count = word_count + ?, max_id = ?, total_length = total_length + ?
+                WHERE id = 0
+                """, (batch_count, batch_max_id, batch_length))
+                self.conn.commit()
+                indexed_id = batch_max_id
+                self._fts_indexed_id = indexed_id
+        except sqlite3.DatabaseError as e:
+            # the rewind app may hold the write lock, the database may be
+            # read-only, or fts5 or its trigram tokenizer may be missing
+            logger.debug(f"transcript full-text index unavailable: {e}")
+            self.conn.rollback()
+            return usable
+
+    def _uses_text_timestamps(self, table: str, column: str) -> bool:
+        """check whether a timestamp column stores iso strings instead of milliseconds.
+
+        the rewind database has stored timestamps in both formats. the first
+        non-null value is probed once per connection and the answer cached, so
+        queries only need to run in the matching format.
+
+        args:
+            table: the table holding the timestamp column
+            column: the timestamp column to probe
+
+        returns:
+            true if the column holds iso formatted strings
+        """
+
+        key = (table, column)
+        if key not in self._text_timestamps:
+            try:
+                self.cursor.execute(f"SELECT typeof({column}) FROM {table} WHERE {column} IS NOT NULL LIMIT 1")
+                row = self.cursor.fetchone()
+            except sqlite3.DatabaseError as e:
+                logger.debug(f"could not probe timestamp format of {table}.{column}: {e}")
+                return False
+            self._text_timestamps[key] = bool(row) and row[0] == 'text'
+        return self._text_timestamps[key]
+
+    def _time_range_params(self, start_time: datetime.datetime, end_time: datetime.datetime,
+                           table: str, column: str) -> typing.Tuple[typing.Any, typing.Any]:
+        """convert a time range into half-open query bounds matching a column's format.
+
+        the range is inclusive of end_time, so the exclusive upper bound is the
+        next millisecond. queries compare with `column >= ? AND column < ?`.
+
+        args:
+            start_time: the start datetime of the range
+            end_time: the end datetime of the range
+            table: the table holding the timestamp column
+            column: the timestamp column being compared against
+
+        returns:
+            tuple of (start, end) as milliseconds or iso strings
+        """
+
+        end_time = end_time + datetime.timedelta(milliseconds=1)
+        if self._uses_text_timestamps(table, column):
+            return (start_time.strftime("%Y-%m-%dT%H:%M:%S.") + f"{start_time.microsecond // 1000:03d}",
+                    end_time.strftime("%Y-%m-%dT%H:%M:%S.") + f"{end_time.microsecond // 1000:03d}")
+        return (int(start_time.timestamp() * 1000), int(end_time.timestamp() * 1000))
+
+    def _max_word_offset(self) -> int:
+        """get the largest time offset of any transcript word.
+
+        bounds how far before a time range a recording can start and still have
+        words inside it. answered from idx_tw_offset with a single seek, so it
+        is cheap on every call, including the first one on a new connection.
+
+        returns:
+            the largest transcript_word.timeOffset in milliseconds
+        """
+
+        self.cursor.execute("SELECT MAX(timeOffset) FROM transcript_word")
+        return self.cursor.fetchone()[0] or 0
+
+    def _has_rows_in_range(self, table: str, column: str, start: typing.Any, end: typing.Any) -> bool:
+        """check whether any row of a table falls inside a timestamp range.
+
+        answered from the column's index with a single seek, so it is a cheap
+        guard in front of the expensive search joins.
+
+        args:
+            table: the table to probe
+            column: the indexed timestamp column
+            start: inclusive lower bound, as returned by _time_range_params
+            end: exclusive upper bound, as returned by _time_range_params
+
+        returns:
+            true if at least one row falls in the range
+        """
+
+        self.cursor.execute(f"SELECT 1 FROM {table} WHERE {column} >= ? AND {column} < ? LIMIT 1", (start, end))
+        return self.cursor.fetchone() is not None
+
     def close(self) -> None:
         """close the database connection.
 
@@ -94,6 +494,35 @@ class RewindDB:
         if hasattr(self, 'conn') and self.conn:
             self.conn.close()
 
+    def verify_transcript_index(self) -> bool:
+        """check the transcript full-text index against the words it was built from.
+
+        connecting only looks for new words. this also compares the count and
+        total length of the indexed words with the stored ones, which reads
+        every word, and rebuilds the index when words were deleted or edited
+        since it was built.
+
+        returns:
+            true if the index was out of date and rebuilt
+        """
+
+        try:
+            self.cursor.execute("SELECT word_count, max_id, total_length FROM transcript_word_fts_sync WHERE id = 0")
+            row = self.cursor.fetchone()
+            if row is not None:
+                word_count, indexed_id, total_length = row
+                self.cursor.execute(
+                    "SELECT COUNT(*), TOTAL(LENGTH(word)) FROM transcript_word WHERE id <= ?", (indexed_id,)
+                )
+                if tuple(self.cursor.fetchone()) == (word_count, total_length):
+                    return False
+        except sqlite3.DatabaseError as e:
+            logger.debug(f"transcript full-text index unavailable: {e}")
+            return False
+
+        self._transcript_fts = self._sync_transcript_fts('rebuild', 0)
+        return True
+
     def get_audio_transcripts_absolute(self, start_time: datetime.datetime,
                                       end_time: datetime.datetime, 
                                       speech_source: typing.Optional[str] = None) -> typing.List[dict]:
@@ -117,15 +546,28 @@ class RewindDB:
         if end_time.tzinfo is None:
             end_time = end_time.replace(tzinfo=datetime.timezone.utc)
 
-        # Try both timestamp formats
         try:
-            # First try with millisecond timestamps
-            start_timestamp = int(start_time.timestamp() * 1000)  # convert to milliseconds
-            end_timestamp = int(end_time.timestamp() * 1000)  # convert to milliseconds
+            start_timestamp, end_timestamp = self._time_range_params(start_time, end_time, 'audio', 'startTime')
+
+            # an empty or inverted range matches nothing
+            if start_timestamp >= end_timestamp:
+                return []
 
-            # Build the WHERE clause based on speech_source filter
-            where_clause = "a.startTime + tw.timeOffset BETWEEN ? AND ?"
-            params = [start_timestamp, end_timestamp]
+            # Build the WHERE clause based on the timestamp format and speech_source filter
+            if self._uses_text_timestamps('audio', 'startTime'):
+                # string timestamps can't be offset in sql, so filter on the recording start
+                where_clause = "a.startTime >= ? AND a.startTime < ?"
+                params = [start_timestamp, end_timestamp]
+            else:
+                # a word's time can't be indexed, so first bound the recording
+                # start, which is at most the longest word offset earlier, and
+                # then check the word time on the recordings that remain
+                where_clause = (
+                    "a.startTime >= ? AND a.startTime < ? "
+                    "AND a.startTime + tw.timeOffset >= ? AND a.startTime + tw.timeOffset < ?"
+                )
+                params = [start_timestamp - self._max_word_offset(), end_timestamp,
+                          start_timestamp, end_timestamp]
             
             if speech_source:
                 where_clause += " AND tw.speechSource = ?"
@@ -135,11 +577,11 @@ class RewindDB:
             SELECT
                 a.id as audio_id,
                 a.startTime as start_time,
-                a.duration,
+                a.duration as audio_duration,
                 tw.id as word_id,
                 tw.word,
                 tw.timeOffset as time_offset,
-                tw.duration,
+                tw.duration as word_duration,
                 tw.speechSource as speech_source,
                 a.path as audio_path
             FROM
@@ -153,79 +595,41 @@ class RewindDB:
             """
 
             self.cursor.execute(query, params)
-            rows = self.cursor.fetchall()
-
-            # If no results, try with string-formatted timestamps
-            if not rows:
-                # Format timestamps as strings
-                start_timestamp = start_time.strftime("%Y-%m-%dT%H:%M:%S.000")
-                end_timestamp = end_time.strftime("%Y-%m-%dT%H:%M:%S.999")
-
-                # Build the WHERE clause for string format
-                where_clause = "a.startTime BETWEEN ? AND ?"
-                params = [start_timestamp, end_timestamp]
-                
-                if speech_source:
-                    where_clause += " AND tw.speechSource = ?"
-                    params.append(speech_source)
-
-                query = f"""
-                SELECT
-                    a.id as audio_id,
-                    a.startTime as start_time,
-                    a.duration,
-                    tw.id as word_id,
-                    tw.word,
-                    tw.timeOffset as time_offset,
-                    tw.duration,
-                    tw.speechSource as speech_source,
-                    a.path as audio_path
-                FROM
-                    audio a
-                JOIN
-                    transcript_word tw ON a.segmentId = tw.segmentId
-                WHERE
-                    {where_clause}
-                ORDER BY
-                    a.startTime, tw.timeOffset
-                """
-
-                self.cursor.execute(query, params)
-                rows = self.cursor.fetchall()
-
+            # iterate the cursor directly so rows are streamed from sqlite
+            # instead of materializing the whole result set first
             results = []
-            for row in rows:
-                # Check if the timestamp is a string or an integer
-                if isinstance(row[1], str):
-                    # Parse the timestamp from the text format
-                    try:
-                        start_time_dt = datetime.datetime.strptime(row[1], "%Y-%m-%dT%H:%M:%S.%f")
-                    except ValueError:
-                        # Try without microseconds
-                        start_time_dt = datetime.datetime.strptime(row[1], "%Y-%m-%dT%H:%M:%S")
+            append = results.append
+
+            # words arrive ordered by recording, so the recording start time is
+            # only converted when it changes rather than once per word
+            start_value = None
+            start_time_dt = None
+
+            for audio_id, start, audio_duration, word_id, word, time_offset, duration, source, path in self.cursor:
+                if start != start_value or start_time_dt is None:
+                    start_value = start
+                    if isinstance(start, str):
+                        # Assume stored timestamps are in UTC
+                        start_time_dt = self._iso_to_datetime(start).replace(tzinfo=datetime.timezone.utc)
+                    else:
+                        start_time_dt = _ms_to_datetime(start)
 
-                    # Assume stored timestamps are in UTC
-                    start_time_dt = start_time_dt.replace(tzinfo=datetime.timezone.utc)
-                    absolute_time = start_time_dt + datetime.timedelta(milliseconds=row[5])
-                else:
-                    # Use the existing _ms_to_datetime method
-                    start_time_dt = self._ms_to_datetime(row[1])
-                    absolute_time = self._ms_to_datetime(row[1] + row[5])
+                absolute_time = start_time_dt + datetime.timedelta(milliseconds=time_offset)
 
                 # Filter to ensure word is within the requested range
                 if not (start_time <= absolute_time <= end_time):
                     continue
 
-                results.append({
-                    'audio_id': row[0],
+                append({
+                    'audio_id': audio_id,
                     'audio_start_time': start_time_dt,
-                    'audio_duration': row[2],
-                    'word_id': row[3],
-                    'word': row[4],
-                    'time_offset': row[5],
-                    'duration': row[6],  # using duration instead of confidence
-                    'speech_source': row[7] if len(row) > 7 else None,
-                    'audio_path': row[8] if len(row) > 8 else None,
+                    'audio_duration': audio_duration,
+                    'word_id': word_id,
+                    'word': word,
+                    'time_offset': time_offset,
+                    'duration': duration,  # using duration instead of confidence
+                    'speech_source': source,
+                    'audio_path': path,
                     'absolute_time': absolute_time
                 })
 
@@ -307,11 +711,12 @@ class RewindDB:
             a list of dictionaries containing ocr data
         """
 
-        # Try both timestamp formats
         try:
-            # First try with millisecond timestamps
-            start_timestamp = int(start_time.timestamp() * 1000)  # convert to milliseconds
-            end_timestamp = int(end_time.timestamp() * 1000)  # convert to milliseconds
+            start_timestamp, end_timestamp = self._time_range_params(start_time, end_time, 'frame', 'createdAt')
+
+            # an empty or inverted range matches nothing
+            if start_timestamp >= end_timestamp:
+                return []
 
             query = """
             SELECT
@@ -330,68 +735,37 @@ class RewindDB:
             JOIN
                 segment s ON f.segmentId = s.id
             WHERE
-                f.createdAt BETWEEN ? AND ?
+                f.createdAt >= ? AND f.createdAt < ?
             ORDER BY
                 f.createdAt
             """
 
             self.cursor.execute(query, (start_timestamp, end_timestamp))
-            rows = self.cursor.fetchall()
-
-            # If no results, try with string-formatted timestamps
-            if not rows:
-                # Format timestamps as strings
-                start_timestamp = start_time.strftime("%Y-%m-%dT%H:%M:%S.000")
-                end_timestamp = end_time.strftime("%Y-%m-%dT%H:%M:%S.999")
-
-                query = """
-                SELECT
-                    f.id as frame_id,
-                    f.createdAt as created_at,
-                    f.segmentId as segment_id,
-                    n.id as node_id,
-                    n.textOffset,
-                    n.textLength,
-                    s.bundleID as app_name,
-                    s.windowName as window_name
-                FROM
-                    frame f
-                JOIN
-                    node n ON f.id = n.frameId
-                JOIN
-                    segment s ON f.segmentId = s.id
-                WHERE
-                    f.createdAt BETWEEN ? AND ?
-                ORDER BY
-                    f.createdAt
-                """
-
-                self.cursor.execute(query, (start_timestamp, end_timestamp))
-                rows = self.cursor.fetchall()
-
             results = []
-            for row in rows:
-                # Check if the timestamp is a string or an integer
-                if isinstance(row[1], str):
-                    # Parse the timestamp from the text format
-                    try:
-                        frame_time = datetime.datetime.strptime(row[1], "%Y-%m-%dT%H:%M:%S.%f")
-                    except ValueError:
-                        # Try without microseconds
-                        frame_time = datetime.datetime.strptime(row[1], "%Y-%m-%dT%H:%M:%S")
-                else:
-                    # Use the existing _ms_to_datetime method
-                    frame_time = self._ms_to_datetime(row[1])
+            append = results.append
+
+            # every node of a frame shares its timestamp, so it is only
+            # converted once per frame
+            created_value = None
+            frame_time = None
+
+            for frame_id, created_at, segment_id, node_id, text_offset, text_length, app_name, window_name in self.cursor:
+                if created_at != created_value or frame_time is None:
+                    created_value = created_at
+                    if isinstance(created_at, str):
+                        frame_time = self._iso_to_datetime(created_at)
+                    else:
+                        frame_time = _ms_to_datetime(created_at)
 
-                results.append({
-                    'frame_id': row[0],
+                append({
+                    'frame_id': frame_id,
                     'frame_time': frame_time,
-                    'segment_id': row[2],
-                    'node_id': row[3],
-                    'text_offset': row[4],
-                    'text_length': row[5],
-                    'application': row[6],
-                    'window': row[7]
+                    'segment_id': segment_id,
+                    'node_id': node_id,
+                    'text_offset': text_offset,
+                    'text_length': text_length,
+                    'application': app_name,
+                    'window': window_name
                 })
 
             return results
@@ -439,9 +813,11 @@ class RewindDB:
         """
 
         try:
-            # Convert to millisecond timestamps
-            start_timestamp = int(start_time.timestamp() * 1000)
-            end_timestamp = int(end_time.timestamp() * 1000)
+            start_timestamp, end_timestamp = self._time_range_params(start_time, end_time, 'frame', 'createdAt')
+
+            # an empty or inverted range matches nothing
+            if start_timestamp >= end_timestamp:
+                return []
 
             # Query the searchRanking_content table for actual OCR text
             query = """
@@ -461,7 +837,7 @@ class RewindDB:
             LEFT JOIN
                 segment s ON f.segmentId = s.id
             WHERE
-                f.createdAt BETWEEN ? AND ?
+                f.createdAt >= ? AND f.createdAt < ?
                 AND src.c0 IS NOT NULL
                 AND src.c0 != ''
             ORDER BY
@@ -469,26 +845,13 @@ class RewindDB:
             """
 
             self.cursor.execute(query, (start_timestamp, end_timestamp))
-            rows = self.cursor.fetchall()
-
-            # If no results with millisecond timestamps, try string format
-            if not rows:
-                start_timestamp_str = start_time.strftime("%Y-%m-%dT%H:%M:%S.000")
-                end_timestamp_str = end_time.strftime("%Y-%m-%dT%H:%M:%S.999")
-
-                self.cursor.execute(query, (start_timestamp_str, end_timestamp_str))
-                rows = self.cursor.fetchall()
-
             results = []
-            for row in rows:
+            for row in self.cursor:
                 # Parse the timestamp
                 if isinstance(row[3], str):
-                    try:
-                        frame_time = datetime.datetime.strptime(row[3], "%Y-%m-%dT%H:%M:%S.%f")
-                    except ValueError:
-                        frame_time = datetime.datetime.strptime(row[3], "%Y-%m-%dT%H:%M:%S")
+                    frame_time = self._iso_to_datetime(row[3])
                 else:
-                    frame_time = self._ms_to_datetime(row[3])
+                    frame_time = _ms_to_datetime(row[3])
 
                 results.append({
                     'content_id': row[0],
@@ -530,171 +893,178 @@ class RewindDB:
 
         return self.get_screen_ocr_text_absolute(start_time, now)
 
-    def search(self, query: str, days: int = 7) -> typing.Dict[str, typing.List[dict]]:
+    def search(self, query: str, days: int = 7,
+               limit: typing.Optional[int] = None,
+               start_time: typing.Optional[datetime.datetime] = None,
+               end_time: typing.Optional[datetime.datetime] = None) -> typing.Dict[str, typing.List[dict]]:
         """search for keywords across both audio and screen data.
 
         performs a search for the given query string across both audio transcripts
-        and screen ocr data from the specified number of days back.
+        and screen ocr data from the specified number of days back, or within an
+        absolute time range when start_time or end_time is given.
+
+        audio matches are returned in time order. a limit keeps the most recent
+        ones, so a caller that gets back limit matches should narrow the range
+        to see earlier ones.
 
         args:
             query: the search string to look for
             days: number of days to look back (default: 7)
+            limit: maximum number of audio word matches to return, the most
+                recent first, each with its context words (default: no limit)
+            start_time: start of an absolute range to search instead of days
+                (default: days before end_time)
+            end_time: end of an absolute range to search (default: now)
 
         returns:
             a dictionary with 'audio' and 'screen' keys containing matching results
         """
 
         # Use UTC timezone to be consistent with get_statistics
-        now = datetime.datetime.now(datetime.timezone.utc)
-        start_time = now - datetime.timedelta(days=days)
+        bounded = start_time is not None or end_time is not None
+        now = end_time if end_time is not None else datetime.datetime.now(datetime.timezone.utc)
+        if start_time is None:
+            start_time = now - datetime.timedelta(days=days)
 
         # search in audio transcripts
-        # Try both timestamp formats (milliseconds and ISO string)
-        start_timestamp_ms = int(start_time.timestamp() * 1000)
-        end_timestamp_ms = int(now.timestamp() * 1000)
-        start_timestamp_str = start_time.strftime("%Y-%m-%dT%H:%M:%S.000")
-        end_timestamp_str = now.strftime("%Y-%m-%dT%H:%M:%S.999")
+        start_timestamp, end_timestamp = self._time_range_params(start_time, now, 'audio', 'startTime')
         search_term = query.lower()
 
-        # first find all matching words
-        # first try with millisecond timestamps
-        audio_query = """
-        SELECT
-            a.id as audio_id,
-            a.startTime as start_time,
-            a.duration,
-            a.segmentId as segment_id,
-            tw.id as word_id,
-            tw.word,
-            tw.timeOffset as time_offset,
-            tw.duration
-        FROM
-            audio a
-        JOIN
-            transcript_word tw ON a.segmentId = tw.segmentId
-        WHERE
-            (CAST(a.startTime AS INTEGER) BETWEEN ? AND ?)
-            AND INSTR(LOWER(tw.word), ?) > 0
-        ORDER BY
-            a.startTime, tw.timeOffset
-        """
-
-        self.cursor.execute(audio_query, (start_timestamp_ms, end_timestamp_ms, search_term))
-        audio_matches = self.cursor.fetchall()
+        # find all matching words together with their surrounding context words
+        # (everything within 60 seconds of the match in the same segment) in a
+        # single query instead of one context lookup per match. matches come from
+        # the full-text index when possible, otherwise from a scan of every word.
+        # words recorded since the index was last synced (a long-lived
+        # connection never syncs again) are not in it, so the ids above the
+        # indexed one are scanned as well. the index only narrows the
+        # candidates: each one is checked against the stored word too, so a
+        # word changed since it was indexed can't come back as a match
+        if self._transcript_fts and len(search_term) >= _FTS_MIN_TERM_LENGTH:
+            match_join = """
+            JOIN (
+                SELECT rowid AS id FROM transcript_word_fts WHERE transcript_word_fts MATCH ?
+                UNION ALL
+                SELECT id FROM transcript_word WHERE id > ? AND INSTR(LOWER(word), ?) > 0
+            ) f ON f.id = m.id"""
+            match_params = ('"' + search_term.replace('"', '""') + '"', self._fts_indexed_id, search_term)
+        else:
+            match_join = ""
+            match_params = ()
 
-        # if no results with millisecond timestamps, try with string timestamps
-        if not audio_matches:
-            audio_query = """
+        audio_query = f"""
+        SELECT
+            hit.audio_id,
+            hit.start_time,
+            hit.audio_duration,
+            hit.match_word_id,
+            ctx.id as word_id,
+            ctx.word,
+            ctx.timeOffset as time_offset,
+            ctx.duration as word_duration
+        FROM (
             SELECT
                 a.id as audio_id,
                 a.startTime as start_time,
-                a.duration,
-                a.segmentId as segment_id,
-                tw.id as word_id,
-                tw.word,
-                tw.timeOffset as time_offset,
-                tw.duration
+                a.duration as audio_duration,
+                m.id as match_word_id,
+                m.segmentId as segment_id,
+                m.timeOffset as match_offset
             FROM
                 audio a
             JOIN
-                transcript_word tw ON a.segmentId = tw.segmentId
+                transcript_word m ON a.segmentId = m.segmentId
+            {match_join}
             WHERE
-                (a.startTime BETWEEN ? AND ?)
-                AND INSTR(LOWER(tw.word), ?) > 0
+                (a.startTime >= ? AND a.startTime < ?)
+                AND INSTR(LOWER(m.word), ?) > 0
             ORDER BY
-                a.startTime, tw.timeOffset
-            """
+                a.startTime DESC, m.timeOffset DESC, m.id DESC
+            LIMIT ?
+        ) hit
+        JOIN
+            transcript_word ctx ON ctx.segmentId = hit.segment_id
+            AND ctx.timeOffset BETWEEN hit.match_offset - 60000 AND hit.match_offset + 60000
+        ORDER BY
+            hit.start_time, hit.match_offset, hit.match_word_id, ctx.timeOffset
+        """
 
-            self.cursor.execute(audio_query, (start_timestamp_str, end_timestamp_str, search_term))
-            audio_matches = self.cursor.fetchall()
+        # skip the word scan entirely when nothing was recorded in the window
+        has_audio = self._has_rows_in_range('audio', 'startTime', start_timestamp, end_timestamp)
+        if has_audio:
+            # a negative limit means no limit to sqlite
+            audio_limit = limit if limit is not None else -1
+            self.cursor.execute(audio_query, (*match_params, start_timestamp, end_timestamp, search_term, audio_limit))
 
         audio_results = []
 
-        # for each match, get surrounding context words
-        for match in audio_matches:
-            audio_id = match[0]
-            start_time_val = match[1]
-            segment_id = match[3]
-            match_word_id = match[4]
-            match_word = match[5]
-            match_time_offset = match[6]
-
-            # get context words (words before and after the match)
-            # First, get ALL words in this segment to ensure we have proper context
-            context_query = """
-            SELECT
-                tw.id as word_id,
-                tw.word,
-                tw.timeOffset as time_offset,
-                tw.duration
-            FROM
-                transcript_word tw
-            WHERE
-                tw.segmentId = ?
-            ORDER BY
-                tw.timeOffset
-            """
-
-            self.cursor.execute(context_query, (segment_id,))
-            all_words = self.cursor.fetchall()
+        # rows arrive grouped by match, so the start time only needs parsing
+        # when it changes
+        start_time_val = None
+        start_time_dt = None
 
-            # Filter to get words within 60 seconds before and after the match
-            context_before = match_time_offset - 60000  # 60 seconds before
-            context_after = match_time_offset + 60000   # 60 seconds after
-
-            context_words = [
-                word for word in all_words
-                if context_before <= word[2] <= context_after
-            ]
+        for row in (self.cursor if has_audio else ()):
+            audio_id = row[0]
+            match_word_id = row[3]
+            word_id = row[4]
+            word = row[5]
+            time_offset = row[6]
+            duration = row[7]
 
             # parse the start time
-            if isinstance(start_time_val, str):
-                try:
-                    start_time_dt = datetime.datetime.strptime(start_time_val, "%Y-%m-%dT%H:%M:%S.%f")
-                except ValueError:
+            if row[1] != start_time_val or start_time_dt is None:
+                start_time_val = row[1]
+                if isinstance(start_time_val, str):
                     try:
-                        start_time_dt = datetime.datetime.strptime(start_time_val, "%Y-%m-%dT%H:%M:%S")
+                        start_time_dt = self._iso_to_datetime(start_time_val)
                     except ValueError:
-                        start_time_dt = self._ms_to_datetime(int(start_time_val))
-            else:
-                start_time_dt = self._ms_to_datetime(start_time_val)
-
-            # add all context words to results
-            for context_word in context_words:
-                word_id = context_word[0]
-                word = context_word[1]
-                time_offset = context_word[2]
-                duration = context_word[3]
-
-                # calculate absolute time for this word
-                if isinstance(start_time_val, str):
-                    if isinstance(time_offset, int):
-                        absolute_time = start_time_dt + datetime.timedelta(milliseconds=time_offset)
-                    else:
-                        absolute_time = start_time_dt
+                        start_time_dt = _ms_to_datetime(int(start_time_val))
                 else:
-                    absolute_time = self._ms_to_datetime(start_time_val + time_offset)
+                    start_time_dt = _ms_to_datetime(start_time_val)
 
-                # mark if this is the actual match
-                is_match = (word_id == match_word_id)
-
-                audio_results.append({
-                    'audio_id': audio_id,
-                    'audio_start_time': start_time_dt,
-                    'audio_duration': match[2],
-                    'word_id': word_id,
-                    'word': word,
-                    'time_offset': time_offset,
-                    'duration': duration,
-                    'absolute_time': absolute_time,
-                    'is_match': is_match
-                })
+            # calculate absolute time for this word
+            if isinstance(start_time_val, str):
+                if isinstance(time_offset, int):
+                    absolute_time = start_time_dt + datetime.timedelta(milliseconds=time_offset)
+                else:
+                    absolute_time = start_time_dt
+            else:
+                absolute_time = _ms_to_datetime(start_time_val + time_offset)
+
+            # mark if this is the actual match
+            is_match = (word_id == match_word_id)
+
+            audio_results.append({
+                'audio_id': audio_id,
+                'audio_start_time': start_time_dt,
+                'audio_duration': row[2],
+                'word_id': word_id,
+                'word': word,
+                'time_offset': time_offset,
+                'duration': duration,
+                'absolute_time': absolute_time,
+                'is_match': is_match
+            })
 
         # Search in screen OCR data
         try:
             # First, try to use the searchRanking_content table which contains OCR text content
             logger.info(f"Searching for '{search_term}' in searchRanking_content table")
-            screen_query = """
+
+            # add wildcards for LIKE query. LIKE already folds ascii case, so the
+            # columns are compared directly rather than through LOWER() per row
+            like_term = f"%{search_term}%"
+            start_timestamp, end_timestamp = self._time_range_params(start_time, now, 'frame', 'createdAt')
+
+            # the ranked content is only bounded by frame time when an explicit
+            # range was asked for; a days lookback keeps the most recent matches
+            if bounded:
+                time_clause = "AND f.createdAt >= ? AND f.createdAt < ?"
+                screen_params = (like_term, start_timestamp, end_timestamp)
+            else:
+                time_clause = ""
+                screen_params = (like_term,)
+
+            screen_query = f"""
             SELECT
                 src.id as content_id,
                 src.c0 as text_content,
@@ -713,26 +1083,32 @@ class RewindDB:
             LEFT JOIN
                 segment s ON f.segmentId = s.id
             WHERE
-                LOWER(src.c0) LIKE ?
+                src.c0 LIKE ?
+                {time_clause}
             ORDER BY
                 src.id DESC
             LIMIT 100  -- Limit results to avoid performance issues
             """
 
-            # add wildcards for LIKE query
-            like_term = f"%{search_term}%"
-            self.cursor.execute(screen_query, (like_term,))
+            self.cursor.execute(screen_query, screen_params)
             screen_rows = self.cursor.fetchall()
 
+            # the remaining queries are bounded by frame time, so they are only
+            # worth running when some frame was captured in the window
             if not screen_rows:
+                has_frames = self._has_rows_in_range('frame', 'createdAt', start_timestamp, end_timestamp)
+
+            if not screen_rows and has_frames:
                 logger.info(f"No results found in searchRanking_content table, trying search_content table")
+                # one row per frame, carrying its first node; the per-node rows
+                # would only collapse into the same result below.
                 # Try to use the search_content table for full-text search
                 screen_query = """
                 SELECT
                     f.id as frame_id,
                     f.createdAt as created_at,
                     f.segmentId as segment_id,
-                    n.id as node_id,
+                    MIN(n.id) as node_id,
                     n.textOffset,
                     n.textLength,
                     s.bundleID as app_name,
@@ -747,8 +1123,10 @@ class RewindDB:
                 JOIN
                     search_content sc ON f.id = sc.docid
                 WHERE
-                    f.createdAt BETWEEN ? AND ?
-                    AND (LOWER(sc.c0text) LIKE ? OR LOWER(sc.c1otherText) LIKE ?)
+                    f.createdAt >= ? AND f.createdAt < ?
+                    AND (sc.c0text LIKE ? OR sc.c1otherText LIKE ?)
+                GROUP BY
+                    f.id
                 ORDER BY
                     f.createdAt
                 """
@@ -757,14 +1135,14 @@ class RewindDB:
                 screen_rows = self.cursor.fetchall()
 
             # If still no results, try searching in window names and bundle IDs
-            if not screen_rows:
+            if not screen_rows and has_frames:
                 logger.info(f"No results found in search_content table, trying window names and bundle IDs")
                 screen_query = """
                 SELECT
                     f.id as frame_id,
                     f.createdAt as created_at,
                     f.segmentId as segment_id,
-                    n.id as node_id,
+                    MIN(n.id) as node_id,
                     n.textOffset,
                     n.textLength,
                     s.bundleID as app_name,
@@ -777,8 +1155,10 @@ class RewindDB:
                 JOIN
                     segment s ON f.segmentId = s.id
                 WHERE
-                    f.createdAt BETWEEN ? AND ?
-                    AND (LOWER(s.windowName) LIKE ? OR LOWER(s.bundleID) LIKE ?)
+                    f.createdAt >= ? AND f.createdAt < ?
+                    AND (s.windowName LIKE ? OR s.bundleID LIKE ?)
+                GROUP BY
+                    f.id
                 ORDER BY
                     f.createdAt
                 LIMIT 100  -- Limit results to avoid performance issues
@@ -790,19 +1170,22 @@ class RewindDB:
             screen_results = []
             seen_content = set()  # Track seen content to avoid duplicates
 
+            # only the searchRanking_content query returns the ocr text itself
+            has_text = bool(screen_rows) and 'text_content' in screen_rows[0].keys()
+
             for row in screen_rows:
                 result = {}
 
                 # Handle results from searchRanking_content query
-                if len(row) >= 4 and row[0] is not None and row[1] is not None:
+                if has_text and row['text_content'] is not None:
                     # Find the search term in the text and provide context around it
-                    full_text = row[1] if row[1] else ""
+                    full_text = row['text_content']
                     search_term_lower = search_term.lower()
                     full_text_lower = full_text.lower()
 
                     # Skip results from Rewind.ai application (internal app)
-                    app_name = row[7] if len(row) > 7 else None
-                    window_name = row[8] if len(row) > 8 else None
+                    app_name = row['app_name']
+                    window_name = row['window_name']
 
                     # Check for various Rewind.ai identifiers
                     if (app_name and ("rewind" in str(app_name).lower() or "memoryvault" in str(app_name).lower())) or \
@@ -859,7 +1242,7 @@ class RewindDB:
                         context_text = full_text[:400] + "..." if len(full_text) > 400 else full_text
 
                     # Create a content signature for deduplication (based on normalized text, app, window, and time window)
-                    frame_time = self._ms_to_datetime(row[5]) if len(row) > 5 and row[5] else None
+                    frame_time = _ms_to_datetime(row['created_at']) if row['created_at'] else None
 
                     # Normalize text for better deduplication (remove extra spaces, numbers, special chars)
                     import re
@@ -881,30 +1264,30 @@ class RewindDB:
                     seen_content.add(content_signature)
 
                     result = {
-                        'content_id': row[0],
+                        'content_id': row['content_id'],
                         'text': context_text,
                         'full_text': full_text,  # Keep full text for debugging
-                        'timestamp_info': row[2],
-                        'window_info': row[3],
-                        'frame_id': row[4] if len(row) > 4 else None,
+                        'timestamp_info': row['timestamp_info'],
+                        'window_info': row['window_info'],
+                        'frame_id': row['frame_id'],
                         'frame_time': frame_time,
-                        'segment_id': row[6] if len(row) > 6 else None,
-                        'application': row[7] if len(row) > 7 else None,
-                        'window': row[8] if len(row) > 8 else None,
-                        'image_file': row[9] if len(row) > 9 else None
+                        'segment_id': row['segment_id'],
+                        'application': app_name,
+                        'window': window_name,
+                        'image_file': row['imageFileName']
                     }
                 # Handle results from other queries
                 else:
                     # Skip results from Rewind.ai application (internal app)
-                    app_name = row[6] if len(row) > 6 else None
-                    window_name = row[7] if len(row) > 7 else None
+                    app_name = row['app_name']
+                    window_name = row['window_name']
 
                     # Check for various Rewind.ai identifiers
                     if (app_name and ("rewind" in str(app_name).lower() or "memoryvault" in str(app_name).lower())) or \
                        (window_name and "rewind" in str(window_name).lower()):
                         continue  # Skip Rewind.ai internal app results
 
-                    frame_time = self._ms_to_datetime(row[1]) if row[1] else None
+                    frame_time = _ms_to_datetime(row['created_at']) if row['created_at'] else None
                     text_content = f"Screen match in {app_name} - {window_name}" if app_name and window_name else "Screen match"
 
                     # Create a content signature for deduplication
@@ -927,15 +1310,15 @@ class RewindDB:
                     seen_content.add(content_signature)
 
                     result = {
-                        'frame_id': row[0],
+                        'frame_id': row['frame_id'],
                         'frame_time': frame_time,
-                        'segment_id': row[2] if len(row) > 2 else None,
-                        'node_id': row[3] if len(row) > 3 else None,
-                        'text_offset': row[4] if len(row) > 4 else None,
-                        'text_length': row[5] if len(row) > 5 else None,
+                        'segment_id': row['segment_id'],
+                        'node_id': row['node_id'],
+                        'text_offset': row['textOffset'],
+                        'text_length': row['textLength'],
                         'application': app_name,
                         'window': window_name,
-                        'image_file': row[8] if len(row) > 8 else None,
+                        'image_file': row['imageFileName'],
                         'text': text_content
                     }
 
@@ -964,11 +1347,12 @@ class RewindDB:
             a list of dictionaries containing segment data
         """
 
-        # Try both timestamp formats
         try:
-            # First try with millisecond timestamps
-            start_timestamp = int(start_time.timestamp() * 1000)
-            end_timestamp = int(end_time.timestamp() * 1000)
+            start_timestamp, end_timestamp = self._time_range_params(start_time, end_time, 'segment', 'startDate')
+
+            # an empty or inverted range matches nothing
+            if start_timestamp >= end_timestamp:
+                return []
 
             query = """
             SELECT
@@ -981,70 +1365,28 @@ class RewindDB:
             FROM
                 segment
             WHERE
-                (startDate BETWEEN ? AND ?) OR
-                (endDate BETWEEN ? AND ?) OR
-                (startDate <= ? AND endDate >= ?)
+                startDate < ? AND COALESCE(endDate, startDate) >= ?
             ORDER BY
                 startDate
             """
 
-            self.cursor.execute(query, (
-                start_timestamp, end_timestamp,
-                start_timestamp, end_timestamp,
-                start_timestamp, end_timestamp
-            ))
-            rows = self.cursor.fetchall()
-
-            # If no results, try with string-formatted timestamps
-            if not rows:
-                # Format timestamps as strings
-                start_timestamp = start_time.strftime("%Y-%m-%dT%H:%M:%S.000")
-                end_timestamp = end_time.strftime("%Y-%m-%dT%H:%M:%S.999")
-
-                query = """
-                SELECT
-                    id,
-                    startDate,
-                    endDate,
-                    bundleID,
-                    windowName,
-                    browserUrl
-                FROM
-                    segment
-                WHERE
-                    (startDate BETWEEN ? AND ?) OR
-                    (endDate BETWEEN ? AND ?) OR
-                    (startDate <= ? AND endDate >= ?)
-                ORDER BY
-                    startDate
-                """
-
-                self.cursor.execute(query, (
-                    start_timestamp, end_timestamp,
-                    start_timestamp, end_timestamp,
-                    start_timestamp, end_timestamp
-                ))
-                rows = self.cursor.fetchall()
-
+            # a segment overlaps the range when it starts before the range ends
+            # and ends after it starts; segments still in progress have no end
+            self.cursor.execute(query, (end_timestamp, start_timestamp))
             results = []
-            for row in rows:
+            for row in self.cursor:
                 # Check if the timestamps are strings or integers
                 if isinstance(row[1], str) and isinstance(row[2], str):
                     # Parse the timestamps from the text format
-                    try:
-                        start_time_dt = datetime.datetime.strptime(row[1], "%Y-%m-%dT%H:%M:%S.%f")
-                        end_time_dt = datetime.datetime.strptime(row[2], "%Y-%m-%dT%H:%M:%S.%f")
-                    except ValueError:
-                        # Try without microseconds
-                        start_time_dt = datetime.datetime.strptime(row[1], "%Y-%m-%dT%H:%M:%S")
-                        end_time_dt = datetime.datetime.strptime(row[2], "%Y-%m-%dT%H:%M:%S")
+                    start_time_dt = self._iso_to_datetime(row[1])
+                    end_time_dt = self._iso_to_datetime(row[2])
 
                     # Calculate duration in seconds
                     duration_seconds = (end_time_dt - start_time_dt).total_seconds()
                 else:
-                    # Use the existing _ms_to_datetime method
-                    start_time_dt = self._ms_to_datetime(row[1])
-                    end_time_dt = self._ms_to_datetime(row[2])
+                    # Use the shared _ms_to_datetime helper
+                    start_time_dt = _ms_to_datetime(row[1])
+                    end_time_dt = _ms_to_datetime(row[2])
                     duration_seconds = (row[2] - row[1]) / 1000
 
                 results.append({
@@ -1081,6 +1423,10 @@ class RewindDB:
         start_timestamp = int(start_time.timestamp() * 1000)
         end_timestamp = int(end_time.timestamp() * 1000)
 
+        # an inverted range matches nothing
+        if start_timestamp > end_timestamp:
+            return []
+
         query = """
         SELECT
             id,
@@ -1093,49 +1439,70 @@ class RewindDB:
         FROM
             event
         WHERE
-            (startDate BETWEEN ? AND ?) OR
-            (endDate BETWEEN ? AND ?) OR
-            (startDate <= ? AND endDate >= ?)
+            startDate <= ? AND COALESCE(endDate, startDate) >= ?
         ORDER BY
             startDate
         """
 
-        self.cursor.execute(query, (
-            start_timestamp, end_timestamp,
-            start_timestamp, end_timestamp,
-            start_timestamp, end_timestamp
-        ))
-        rows = self.cursor.fetchall()
-
-        results = []
-        for row in rows:
-            results.append({
-                'id': row[0],
-                'title': row[1],
-                'start_time': self._ms_to_datetime(row[2]),
-                'end_time': self._ms_to_datetime(row[3]),
-                'location': row[4],
-                'notes': row[5],
-                'calendar': row[6],
-                'duration_seconds': (row[3] - row[2]) / 1000
-            })
+        # an event overlaps the range when it starts before the range ends and
+        # ends after it starts
+        self.cursor.execute(query, (end_timestamp, start_timestamp))
 
-        return results
+        return [
+            {
+                'id': event_id,
+                'title': title,
+                'start_time': _ms_to_datetime(start_date),
+                'end_time': _ms_to_datetime(end_date),
+                'location': location,
+                'notes': notes,
+                'calendar': calendar,
+                'duration_seconds': (end_date - start_date) / 1000
+            }
+            for event_id, title, start_date, end_date, location, notes, calendar in self.cursor
+        ]
 
-    def _ms_to_datetime(self, ms: int) -> datetime.datetime:
-        """convert milliseconds since epoch to datetime object.
+    def _iso_to_datetime(self, value: str) -> datetime.datetime:
+        """convert an iso formatted timestamp string to a datetime object.
 
-        utility function to convert millisecond timestamps to datetime objects.
+        the stored format is fixed (YYYY-MM-DDTHH:MM:SS with optional fractional
+        seconds), so the fields are sliced out directly, which is much cheaper
+        than strptime in per-row loops. anything else is handed to strptime.
 
         args:
-            ms: milliseconds since epoch
+            value: timestamp string as stored in the database
 
         returns:
-            datetime object representing the timestamp in UTC
+            naive datetime object representing the timestamp
         """
 
-        # Convert to UTC datetime to match the now() call in get_statistics
-        return datetime.datetime.fromtimestamp(ms / 1000, tz=datetime.timezone.utc)
+        try:
+            return datetime.datetime(
+                int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                int(value[11:13]), int(value[14:16]), int(value[17:19]),
+                int(value[20:26].ljust(6, '0')) if len(value) > 20 else 0
+            )
+        except ValueError:
+            try:
+                return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+            except ValueError:
+                return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
+
+    def _to_datetime(self, value: typing.Any) -> typing.Optional[datetime.datetime]:
+        """convert a stored timestamp in either format to a datetime object.
+
+        args:
+            value: milliseconds since epoch, an iso formatted string, or None
+
+        returns:
+            datetime object representing the timestamp, or None for None
+        """
+
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return self._iso_to_datetime(value)
+        return _ms_to_datetime(value)
 
     def get_statistics(self, days: int = 0, hours: int = 0, minutes: int = 0, seconds: int = 0) -> dict:
         """collect comprehensive statistics about the rewind database.
@@ -1163,6 +1530,15 @@ class RewindDB:
             delta = datetime.timedelta(days=days, hours=hours, minutes=minutes, seconds=seconds)
             start_time = now - delta
 
+            # an empty or negative window has nothing to count
+            if delta <= datetime.timedelta(0):
+                return {
+                    'audio': {'earliest_date': None, 'total_audio': 0, 'total_words': 0, 'relative_count': 0},
+                    'screen': {'earliest_date': None, 'total_frames': 0, 'total_nodes': 0, 'relative_count': 0},
+                    'app_usage': {'top_apps': [], 'total_apps': 0, 'total_segments': 0, 'total_hours': 0.0},
+                    'database': {'table_stats': [], 'db_size_mb': 0, 'table_count': 0}
+                }
+
             # for relative time queries, we only need one time range
             hour_ago = start_time
             day_ago = start_time
@@ -1175,27 +1551,37 @@ class RewindDB:
             week_ago = now - datetime.timedelta(days=7)
             month_ago = now - datetime.timedelta(days=30)
 
-        # Audio statistics
-        audio_stats = self._get_audio_stats(now, hour_ago, day_ago, week_ago, month_ago, is_relative)
+        # Run all the queries in one read transaction, so the shared lock is
+        # taken once and every section sees the same snapshot of the database
+        started_transaction = not self.conn.in_transaction
+        if started_transaction:
+            self.cursor.execute("BEGIN")
 
-        # Screen statistics
-        screen_stats = self._get_screen_stats(now, hour_ago, day_ago, week_ago, month_ago, is_relative)
+        try:
+            # Audio statistics
+            audio_stats = self._get_audio_stats(now, hour_ago, day_ago, week_ago, month_ago, is_relative)
 
-        # App usage statistics
-        app_stats = self._get_app_usage_stats(now, week_ago, is_relative)
+            # Screen statistics
+            screen_stats = self._get_screen_stats(now, hour_ago, day_ago, week_ago, month_ago, is_relative)
 
-        # Database statistics
-        # Note: This is the most time-consuming part, so we skip it for relative time queries
-        if is_relative:
-            # For relative time, use a simplified version with just the essential info
-            db_stats = {
-                'table_stats': [],  # Empty list to avoid scanning all tables
-                'db_size_mb': 0,    # Skip file size calculation
-                'table_count': 0    # Skip table count calculation
-            }
-        else:
-            # For standard statistics, get full database stats
-            db_stats = self._get_database_stats()
+            # App usage statistics
+            app_stats = self._get_app_usage_stats(now, week_ago, is_relative)
+
+            # Database statistics
+            # Note: This is the most time-consuming part, so we skip it for relative time queries
+            if is_relative:
+                # For relative time, use a simplified version with just the essential info
+                db_stats = {
+                    'table_stats': [],  # Empty list to avoid scanning all tables
+                    'db_size_mb': 0,    # Skip file size calculation
+                    'table_count': 0    # Skip table count calculation
+                }
+            else:
+                # For standard statistics, get full database stats
+                db_stats = self._get_database_stats()
+        finally:
+            if started_transaction:
+                self.conn.commit()
 
         return {
             'audio': audio_stats,
@@ -1219,167 +1605,77 @@ class RewindDB:
         week_ago_str = week_ago.strftime("%Y-%m-%dT%H:%M:%S")
         month_ago_str = month_ago.strftime("%Y-%m-%dT%H:%M:%S")
 
-        # Log the timestamps for debugging
-        logger.info(f"now: {now}, now_str: {now_str}")
-        logger.info(f"hour_ago: {hour_ago}, hour_ago_str: {hour_ago_str}")
-
-        # Also log the actual datetime objects for comparison
-        logger.info(f"now timezone: {now.tzinfo}")
-        logger.info(f"hour_ago timezone: {hour_ago.tzinfo}")
+        logger.debug(f"Querying audio stats from {hour_ago} to {now}")
+        logger.debug(f"Using string format: {hour_ago_str} to {now_str}")
 
         # Initialize count variables
         hour_count = day_count = week_count = month_count = 0
 
-        # Get transcript counts
+        # Get transcript counts. Words are counted per recording straight from
+        # the transcript_word(segmentId, ...) index instead of joining every
+        # word row against audio
         try:
             if is_relative:
                 # For relative time, only execute one query
-                # Log the SQL query for debugging
-                query = """
-                    SELECT COUNT(*) FROM transcript_word tw
-                    JOIN audio a ON tw.segmentId = a.segmentId
-                    WHERE a.startTime >= ? AND a.startTime <= ?
-                """
-                logger.info(f"Executing query: {query} with params: ({hour_ago_str}, {now_str})")
-
-                self.cursor.execute(query, (hour_ago_str, now_str))
-                result = self.cursor.fetchone()
-                hour_count = result[0] if result else 0
-
-                logger.info(f"Query result: {result}")
-
-                # Try a simpler query to see if there's any data in the audio table
-                self.cursor.execute("SELECT COUNT(*) FROM audio")
-                total_audio_count = self.cursor.fetchone()[0]
-                logger.info(f"Total audio records: {total_audio_count}")
-
-                # Try a query with a wider time range
-                one_year_ago = now - datetime.timedelta(days=365)
-                one_year_ago_str = one_year_ago.strftime("%Y-%m-%dT%H:%M:%S")
                 self.cursor.execute("""
-                    SELECT COUNT(*) FROM audio
-                    WHERE startTime >= ? AND startTime <= ?
-                """, (one_year_ago_str, now_str))
-                year_audio_count = self.cursor.fetchone()[0]
-                logger.info(f"Audio records in the past year: {year_audio_count}")
-
-                # Try to get the earliest and latest audio record
-                self.cursor.execute("SELECT MIN(startTime), MAX(startTime) FROM audio")
-                min_max = self.cursor.fetchone()
-                if min_max and min_max[0] and min_max[1]:
-                    min_time = min_max[0]
-                    max_time = min_max[1]
-                    logger.info(f"Earliest audio record: {min_time}, Latest audio record: {max_time}")
-            else:
-                # For standard statistics, execute all queries
-                # Hour count
-                self.cursor.execute("""
-                    SELECT COUNT(*) FROM transcript_word tw
-                    JOIN audio a ON tw.segmentId = a.segmentId
+                    SELECT SUM((
+                        SELECT COUNT(*) FROM transcript_word tw
+                        WHERE tw.segmentId = a.segmentId
+                    ))
+                    FROM audio a
                     WHERE a.startTime >= ? AND a.startTime <= ?
                 """, (hour_ago_str, now_str))
-                hour_count = self.cursor.fetchone()[0]
-
-                # Day count
-                self.cursor.execute("""
-                    SELECT COUNT(*) FROM transcript_word tw
-                    JOIN audio a ON tw.segmentId = a.segmentId
-                    WHERE a.startTime >= ? AND a.startTime <= ?
-                """, (day_ago_str, now_str))
-                day_count = self.cursor.fetchone()[0]
-
-                # Week count
-                self.cursor.execute("""
-                    SELECT COUNT(*) FROM transcript_word tw
-                    JOIN audio a ON tw.segmentId = a.segmentId
-                    WHERE a.startTime >= ? AND a.startTime <= ?
-                """, (week_ago_str, now_str))
-                week_count = self.cursor.fetchone()[0]
-
-                # Month count
+                result = self.cursor.fetchone()
+                hour_count = (result[0] or 0) if result else 0
+            else:
+                # For standard statistics, count every period in one pass over
+                # the month; the narrower periods are nested inside it. The
+                # LIMIT keeps SQLite from flattening the subquery, which would
+                # repeat the per-recording word count once per period
                 self.cursor.execute("""
-                    SELECT COUNT(*) FROM transcript_word tw
-                    JOIN audio a ON tw.segmentId = a.segmentId
-                    WHERE a.startTime >= ? AND a.startTime <= ?
-                """, (month_ago_str, now_str))
-                month_count = self.cursor.fetchone()[0]
+                    SELECT
+                        SUM(CASE WHEN startTime >= ? THEN words ELSE 0 END),
+                        SUM(CASE WHEN startTime >= ? THEN words ELSE 0 END),
+                        SUM(CASE WHEN startTime >= ? THEN words ELSE 0 END),
+                        SUM(words)
+                    FROM (
+                        SELECT a.startTime AS startTime, (
+                            SELECT COUNT(*) FROM transcript_word tw
+                            WHERE tw.segmentId = a.segmentId
+                        ) AS words
+                        FROM audio a
+                        WHERE a.startTime >= ? AND a.startTime <= ?
+                        LIMIT -1
+                    )
+                """, (hour_ago_str, day_ago_str, week_ago_str, month_ago_str, now_str))
+                hour_count, day_count, week_count, month_count = (count or 0 for count in self.cursor.fetchone())
         except Exception as e:
             logger.error(f"error getting transcript counts: {e}")
             hour_count = day_count = week_count = month_count = 0
 
-        # Get earliest audio record and total counts
+        # Get earliest audio record and total counts in one pass over audio
         if is_relative:
             # For relative time, only consider records within the time period
             try:
                 self.cursor.execute("""
-                    SELECT MIN(startTime) FROM audio
-                    WHERE startTime >= ? AND startTime <= ?
-                """, (hour_ago_str, now_str))
-                earliest_timestamp = self.cursor.fetchone()[0]
-
-                # If no records in the time period, use None
-                if earliest_timestamp is None:
-                    earliest_date = None
-                elif isinstance(earliest_timestamp, str):
-                    try:
-                        earliest_date = datetime.datetime.strptime(earliest_timestamp, "%Y-%m-%dT%H:%M:%S.%f")
-                    except ValueError:
-                        earliest_date = datetime.datetime.strptime(earliest_timestamp, "%Y-%m-%dT%H:%M:%S")
-                elif isinstance(earliest_timestamp, int):
-                    earliest_date = self._ms_to_datetime(earliest_timestamp)
-                else:
-                    earliest_date = None
-            except Exception as e:
-                logger.error(f"error getting earliest audio record: {e}")
-                earliest_date = None
-
-            # Get total audio records within the time period
-            try:
-                self.cursor.execute("""
-                    SELECT COUNT(*) FROM audio
+                    SELECT MIN(startTime), COUNT(*) FROM audio
                     WHERE startTime >= ? AND startTime <= ?
                 """, (hour_ago_str, now_str))
-                total_audio = self.cursor.fetchone()[0]
+                earliest_timestamp, total_audio = self.cursor.fetchone()
             except Exception as e:
-                logger.error(f"error getting total audio count: {e}")
-                total_audio = 0
+                logger.error(f"error getting earliest audio record and count: {e}")
+                earliest_timestamp, total_audio = None, 0
 
-            # Get total transcript words within the time period
-            try:
-                self.cursor.execute("""
-                    SELECT COUNT(*) FROM transcript_word tw
-                    JOIN audio a ON tw.segmentId = a.segmentId
-                    WHERE a.startTime >= ? AND a.startTime <= ?
-                """, (hour_ago_str, now_str))
-                total_words = self.cursor.fetchone()[0]
-            except Exception as e:
-                logger.error(f"error getting total word count: {e}")
-                total_words = 0
+            # The words in the time period were already counted above
+            total_words = hour_count
         else:
             # For standard statistics, get global counts
             try:
-                self.cursor.execute("SELECT MIN(startTime) FROM audio")
-                earliest_timestamp = self.cursor.fetchone()[0]
-                if isinstance(earliest_timestamp, int):
-                    earliest_date = self._ms_to_datetime(earliest_timestamp)
-                elif isinstance(earliest_timestamp, str):
-                    try:
-                        earliest_date = datetime.datetime.strptime(earliest_timestamp, "%Y-%m-%dT%H:%M:%S.%f")
-                    except ValueError:
-                        earliest_date = datetime.datetime.strptime(earliest_timestamp, "%Y-%m-%dT%H:%M:%S")
-                else:
-                    earliest_date = None
+                self.cursor.execute("SELECT MIN(startTime), COUNT(*) FROM audio")
+                earliest_timestamp, total_audio = self.cursor.fetchone()
             except Exception as e:
-                logger.error(f"error getting earliest audio record: {e}")
-                earliest_date = None
-
-            # Get total audio records
-            try:
-                self.cursor.execute("SELECT COUNT(*) FROM audio")
-                total_audio = self.cursor.fetchone()[0]
-            except Exception as e:
-                logger.error(f"error getting total audio count: {e}")
-                total_audio = 0
+                logger.error(f"error getting earliest audio record and count: {e}")
+                earliest_timestamp, total_audio = None, 0
 
             # Get total transcript words
             try:
@@ -1389,6 +1685,13 @@ class RewindDB:
                 logger.error(f"error getting total word count: {e}")
                 total_words = 0
 
+        try:
+            # None when there are no records in the time period
+            earliest_date = self._to_datetime(earliest_timestamp)
+        except Exception as e:
+            logger.error(f"error parsing earliest audio record: {e}")
+            earliest_date = None
+
         result = {
             'earliest_date': earliest_date,
             'total_audio': total_audio,
@@ -1439,115 +1742,46 @@ class RewindDB:
                 """, (hour_ago_str, now_str))
                 hour_count = self.cursor.fetchone()[0]
             else:
-                # For standard statistics, execute all queries
-                # Hour count
-                self.cursor.execute("""
-                    SELECT COUNT(*) FROM node n
-                    JOIN frame f ON n.frameId = f.id
-                    WHERE f.createdAt >= ? AND f.createdAt <= ?
-                """, (hour_ago_str, now_str))
-                hour_count = self.cursor.fetchone()[0]
-
-                # Day count
-                self.cursor.execute("""
-                    SELECT COUNT(*) FROM node n
-                    JOIN frame f ON n.frameId = f.id
-                    WHERE f.createdAt >= ? AND f.createdAt <= ?
-                """, (day_ago_str, now_str))
-                day_count = self.cursor.fetchone()[0]
-
-                # Week count
+                # For standard statistics, count every period in one pass over
+                # the month; the narrower periods are nested inside it
                 self.cursor.execute("""
-                    SELECT COUNT(*) FROM node n
+                    SELECT
+                        SUM(CASE WHEN f.createdAt >= ? THEN 1 ELSE 0 END),
+                        SUM(CASE WHEN f.createdAt >= ? THEN 1 ELSE 0 END),
+                        SUM(CASE WHEN f.createdAt >= ? THEN 1 ELSE 0 END),
+                        COUNT(*)
+                    FROM node n
                     JOIN frame f ON n.frameId = f.id
                     WHERE f.createdAt >= ? AND f.createdAt <= ?
-                """, (week_ago_str, now_str))
-                week_count = self.cursor.fetchone()[0]
-
-                # Month count
-                self.cursor.execute("""
-                    SELECT COUNT(*) FROM node n
-                    JOIN frame f ON n.frameId = f.id
-                    WHERE f.createdAt >= ? AND f.createdAt <= ?
-                """, (month_ago_str, now_str))
-                month_count = self.cursor.fetchone()[0]
+                """, (hour_ago_str, day_ago_str, week_ago_str, month_ago_str, now_str))
+                hour_count, day_count, week_count, month_count = (count or 0 for count in self.cursor.fetchone())
         except Exception as e:
             logger.error(f"error getting ocr counts: {e}")
             hour_count = day_count = week_count = month_count = 0
 
-        # Get earliest frame record and total counts
+        # Get earliest frame record and total counts in one pass over frame
         if is_relative:
             # For relative time, only consider records within the time period
             try:
                 self.cursor.execute("""
-                    SELECT MIN(createdAt) FROM frame
+                    SELECT MIN(createdAt), COUNT(*) FROM frame
                     WHERE createdAt >= ? AND createdAt <= ?
                 """, (hour_ago_str, now_str))
-                earliest_timestamp = self.cursor.fetchone()[0]
-
-                # If no records in the time period, use None
-                if earliest_timestamp is None:
-                    earliest_date = None
-                elif isinstance(earliest_timestamp, int):
-                    earliest_date = self._ms_to_datetime(earliest_timestamp)
-                elif isinstance(earliest_timestamp, str):
-                    try:
-                        earliest_date = datetime.datetime.strptime(earliest_timestamp, "%Y-%m-%dT%H:%M:%S.%f")
-                    except ValueError:
-                        earliest_date = datetime.datetime.strptime(earliest_timestamp, "%Y-%m-%dT%H:%M:%S")
-                else:
-                    earliest_date = None
+                earliest_timestamp, total_frames = self.cursor.fetchone()
             except Exception as e:
-                logger.error(f"error getting earliest frame record: {e}")
-                earliest_date = None
+                logger.error(f"error getting earliest frame record and count: {e}")
+                earliest_timestamp, total_frames = None, 0
 
-            # Get total frame records within the time period
-            try:
-                self.cursor.execute("""
-                    SELECT COUNT(*) FROM frame
-                    WHERE createdAt >= ? AND createdAt <= ?
-                """, (hour_ago_str, now_str))
-                total_frames = self.cursor.fetchone()[0]
-            except Exception as e:
-                logger.error(f"error getting total frame count: {e}")
-                total_frames = 0
-
-            # Get total node records within the time period
-            try:
-                self.cursor.execute("""
-                    SELECT COUNT(*) FROM node n
-                    JOIN frame f ON n.frameId = f.id
-                    WHERE f.createdAt >= ? AND f.createdAt <= ?
-                """, (hour_ago_str, now_str))
-                total_nodes = self.cursor.fetchone()[0]
-            except Exception as e:
-                logger.error(f"error getting total node count: {e}")
-                total_nodes = 0
+            # The nodes in the time period were already counted above
+            total_nodes = hour_count
         else:
             # For standard statistics, get global counts
             try:
-                self.cursor.execute("SELECT MIN(createdAt) FROM frame")
-                earliest_timestamp = self.cursor.fetchone()[0]
-                if isinstance(earliest_timestamp, int):
-                    earliest_date = self._ms_to_datetime(earliest_timestamp)
-                elif isinstance(earliest_timestamp, str):
-                    try:
-                        earliest_date = datetime.datetime.strptime(earliest_timestamp, "%Y-%m-%dT%H:%M:%S.%f")
-                    except ValueError:
-                        earliest_date = datetime.datetime.strptime(earliest_timestamp, "%Y-%m-%dT%H:%M:%S")
-                else:
-                    earliest_date = None
-            except Exception as e:
-                logger.error(f"error getting earliest frame record: {e}")
-                earliest_date = None
-
-            # Get total frame records
-            try:
-                self.cursor.execute("SELECT COUNT(*) FROM frame")
-                total_frames = self.cursor.fetchone()[0]
+                self.cursor.execute("SELECT MIN(createdAt), COUNT(*) FROM frame")
+                earliest_timestamp, total_frames = self.cursor.fetchone()
             except Exception as e:
-                logger.error(f"error getting total frame count: {e}")
-                total_frames = 0
+                logger.error(f"error getting earliest frame record and count: {e}")
+                earliest_timestamp, total_frames = None, 0
 
             # Get total node records
             try:
@@ -1557,6 +1791,13 @@ class RewindDB:
                 logger.error(f"error getting total node count: {e}")
                 total_nodes = 0
 
+        try:
+            # None when there are no records in the time period
+            earliest_date = self._to_datetime(earliest_timestamp)
+        except Exception as e:
+            logger.error(f"error parsing earliest frame record: {e}")
+            earliest_date = None
+
         result = {
             'earliest_date': earliest_date,
             'total_frames': total_frames,
@@ -1591,82 +1832,42 @@ class RewindDB:
         logger.debug(f"Querying app usage from {week_ago} to {now}")
         logger.debug(f"Using string format: {week_ago_str} to {now_str}")
 
-        # Directly query segments from the database
+        # Sum segment durations per app in the database, so only one row per
+        # app comes back instead of every segment in the period
         try:
-            query = """
+            if self._uses_text_timestamps('segment', 'startDate'):
+                duration = "(julianday(endDate) - julianday(startDate)) * 86400.0"
+            else:
+                duration = "(endDate - startDate) / 1000.0"
+
+            # a segment overlaps the period when it starts before the period ends
+            # and ends after it starts; segments without an end count as zero time.
+            # internal Rewind components are skipped, and ties keep first-use order
+            query = f"""
             SELECT
-                id,
-                startDate,
-                endDate,
-                bundleID,
-                windowName,
-                browserUrl
+                COALESCE(bundleID, 'Unknown') AS app,
+                SUM(COALESCE({duration}, 0)) AS seconds
             FROM
                 segment
             WHERE
-                (startDate >= ? AND startDate <= ?) OR
-                (endDate >= ? AND endDate <= ?) OR
-                (startDate <= ? AND endDate >= ?)
+                startDate <= ? AND COALESCE(endDate, startDate) >= ?
+                AND COALESCE(bundleID, '') != 'ai.rewind.audiorecorder'
+            GROUP BY
+                app
             ORDER BY
-                startDate
+                seconds DESC, MIN(startDate)
             """
 
-            self.cursor.execute(query, (
-                week_ago_str, now_str,
-                week_ago_str, now_str,
-                week_ago_str, now_str
-            ))
-            rows = self.cursor.fetchall()
-
-            # Calculate app usage time
-            app_usage = {}
-            for row in rows:
-                app = row[3]  # bundleID
-                if app is None:
-                    app = "Unknown"
-
-                # Skip internal Rewind components
-                if app == "ai.rewind.audiorecorder":
-                    continue
-
-                # Calculate duration in seconds
-                try:
-                    # Handle string timestamps with different formats
-                    if isinstance(row[1], str):
-                        if '.' in row[1]:
-                            start_time = datetime.datetime.strptime(row[1], "%Y-%m-%dT%H:%M:%S.%f")
-                        else:
-                            start_time = datetime.datetime.strptime(row[1], "%Y-%m-%dT%H:%M:%S")
-                    else:  # Handle integer timestamps (milliseconds)
-                        start_time = datetime.datetime.fromtimestamp(row[1]/1000)
-
-                    if isinstance(row[2], str):
-                        if '.' in row[2]:
-                            end_time = datetime.datetime.strptime(row[2], "%Y-%m-%dT%H:%M:%S.%f")
-                        else:
-                            end_time = datetime.datetime.strptime(row[2], "%Y-%m-%dT%H:%M:%S")
-                    else:  # Handle integer timestamps (milliseconds)
-                        end_time = datetime.datetime.fromtimestamp(row[2]/1000)
-
-                    duration = (end_time - start_time).total_seconds()
-                except Exception as e:
-                    logger.debug(f"Error parsing timestamps for app {row[3]}: {e}")
-                    duration = 0  # Skip this segment if timestamps can't be parsed
-
-                if app in app_usage:
-                    app_usage[app] += duration
-                else:
-                    app_usage[app] = duration
+            self.cursor.execute(query, (now_str, week_ago_str))
+            sorted_apps = [(app, seconds) for app, seconds in self.cursor]
         except Exception as e:
             logger.error(f"error getting segment data: {e}")
-            app_usage = {}
-
-        # Sort apps by usage time (filtering out internal components)
-        sorted_apps = sorted(app_usage.items(), key=lambda x: x[1], reverse=True)
+            sorted_apps = []
 
         # Get top 10 apps
         top_apps = []
-        total_duration = sum(app_usage.values()) if app_usage else 1  # Avoid division by zero
+        total_seconds = sum(seconds for _, seconds in sorted_apps)
+        total_duration = total_seconds if sorted_apps else 1  # Avoid division by zero
 
         for app, duration in sorted_apps[:10]:
             hours = duration / 3600
@@ -1682,14 +1883,8 @@ class RewindDB:
                 # For relative time, only count segments within the time period
                 self.cursor.execute("""
                     SELECT COUNT(*) FROM segment
-                    WHERE (startDate BETWEEN ? AND ?) OR
-                          (endDate BETWEEN ? AND ?) OR
-                          (startDate <= ? AND endDate >= ?)
-                """, (
-                    week_ago_str, now_str,
-                    week_ago_str, now_str,
-                    week_ago_str, now_str
-                ))
+                    WHERE startDate <= ? AND COALESCE(endDate, startDate) >= ?
+                """, (now_str, week_ago_str))
             else:
                 # For standard statistics, count all segments
                 self.cursor.execute("SELECT COUNT(*) FROM segment")
@@ -1701,11 +1896,28 @@ class RewindDB:
 
         return {
             'top_apps': top_apps,
-            'total_apps': len(app_usage),
+            'total_apps': len(sorted_apps),
             'total_segments': total_segments,
-            'total_hours': round(sum(app_usage.values()) / 3600, 2)
+            'total_hours': round(total_seconds / 3600, 2)
         }
 
+    def _db_modified(self) -> typing.Optional[tuple]:
+        """get a key that changes whenever the database is written.
+
+        rewind writes through the write-ahead log, so the mtime of the -wal
+        file is part of the key as well as the database file's own.
+
+        returns:
+            tuple of modification times, or none if they can't be read
+        """
+
+        try:
+            wal_path = f"{self.db_path}-wal"
+            return (os.path.getmtime(self.db_path),
+                    os.path.getmtime(wal_path) if os.path.exists(wal_path) else None)
+        except OSError:
+            return None
+
     def _get_database_stats(self) -> dict:
         """collect general statistics about the database.
 
@@ -1714,12 +1926,39 @@ class RewindDB:
         returns:
             dict: dictionary with database statistics
         """
+        # The counts only change when the database is written
+        modified = self._db_modified()
+        if modified is not None and self._db_stats_cache and self._db_stats_cache[0] == modified:
+            return self._db_stats_cache[1]
+
         # Get table counts
         table_stats = []
         try:
-            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
+            # the transcript full-text index and its shadow tables belong to
+            # this library rather than to rewind, so they are left out
+            self.cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' "
+                "AND name NOT LIKE 'transcript_word_fts%'"
+            )
             tables = self.cursor.fetchall()
 
+            # Count every table in one round trip. A single unreadable table
+            # (e.g. a virtual table whose module isn't loaded) fails the whole
+            # statement, in which case the tables are counted one by one below
+            counted_tables = [table[0] for table in tables if table[0] != 'tokenizer']
+            if counted_tables:
+                count_query = " UNION ALL ".join(
+                    'SELECT ?, COUNT(*) FROM "{}"'.format(name.replace('"', '""'))
+                    for name in counted_tables
+                )
+                try:
+                    self.cursor.execute(count_query, counted_tables)
+                    counts = dict(self.cursor.fetchall())
+                    tables = [table for table in tables if table[0] not in counts]
+                    table_stats.extend({'table': name, 'records': counts[name]} for name in counted_tables)
+                except sqlite3.DatabaseError as e:
+                    logger.debug(f"batched table count failed, counting tables individually: {e}")
+
             for table in tables:
                 table_name = table[0]
                 try:
@@ -1759,19 +1998,33 @@ class RewindDB:
 
         # Get database file size
         try:
-            import os
             db_size = os.path.getsize(self.db_path)
             db_size_mb = round(db_size / (1024 * 1024), 2)
         except Exception as e:
             logger.error(f"error getting database file size: {e}")
             db_size_mb = 0
 
-        return {
+        # the file size can't be split by table, so note when it includes the
+        # full-text index built by this library
+        try:
+            self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='transcript_word_fts'")
+            size_includes_fts = self.cursor.fetchone() is not None
+        except Exception as e:
+            logger.error(f"error checking for the transcript full-text index: {e}")
+            size_includes_fts = False
+
+        stats = {
             'table_stats': table_stats,
             'db_size_mb': db_size_mb,
+            'db_size_includes_fts': size_includes_fts,
             'table_count': len(table_stats)
         }
 
+        if modified is not None:
+            self._db_stats_cache = (modified, stats)
+
+        return stats
+
     def __enter__(self):
         """context manager entry.
 
@@ -1832,21 +2085,10 @@ class RewindDB:
             if not row:
                 return None
 
-            # parse the timestamp
-            if isinstance(row[1], str):
-                try:
-                    frame_time = datetime.datetime.strptime(row[1], "%Y-%m-%dT%H:%M:%S.%f")
-                except ValueError:
-                    # try without microseconds
-                    frame_time = datetime.datetime.strptime(row[1], "%Y-%m-%dT%H:%M:%S")
-            else:
-                # use the existing _ms_to_datetime method
-                frame_time = self._ms_to_datetime(row[1])
-
             # construct the result
             result = {
                 'frame_id': row[0],
-                'frame_time': frame_time,
+                'frame_time': self._to_datetime(row[1]),
                 'segment_id': row[2],
                 'image_file': row[3],
                 'application': row[4],
@@ -1875,11 +2117,33 @@ class RewindDB:
             a list of dictionaries containing screenshot data
         """
 
-        # try both timestamp formats
+        return list(self.iter_screenshots_absolute(start_time, end_time, limit))
+
+    def iter_screenshots_absolute(self, start_time: datetime.datetime,
+                                  end_time: datetime.datetime,
+                                  limit: int = 100) -> typing.Iterator[dict]:
+        """iterate over screenshots within an absolute time range.
+
+        same as get_screenshots_absolute, but rows are converted as they are
+        stepped from sqlite instead of being collected into a list, so callers
+        that stop early never fetch the rest. the query runs on its own cursor,
+        so other queries can be made while iterating.
+
+        args:
+            start_time: the start datetime to query from
+            end_time: the end datetime to query to
+            limit: maximum number of screenshots to return (default: 100)
+
+        returns:
+            an iterator of dictionaries containing screenshot data
+        """
+
         try:
-            # first try with millisecond timestamps
-            start_timestamp = int(start_time.timestamp() * 1000)  # convert to milliseconds
-            end_timestamp = int(end_time.timestamp() * 1000)  # convert to milliseconds
+            start_timestamp, end_timestamp = self._time_range_params(start_time, end_time, 'frame', 'createdAt')
+
+            # an empty or inverted range matches nothing
+            if start_timestamp >= end_timestamp:
+                return
 
             query = """
             SELECT
@@ -1894,71 +2158,38 @@ class RewindDB:
             LEFT JOIN
                 segment s ON f.segmentId = s.id
             WHERE
-                f.createdAt BETWEEN ? AND ?
+                f.createdAt >= ? AND f.createdAt < ?
             ORDER BY
                 f.createdAt DESC
             LIMIT ?
             """
 
-            self.cursor.execute(query, (start_timestamp, end_timestamp, limit))
-            rows = self.cursor.fetchall()
-
-            # if no results, try with string-formatted timestamps
-            if not rows:
-                # format timestamps as strings
-                start_timestamp = start_time.strftime("%Y-%m-%dT%H:%M:%S.000")
-                end_timestamp = end_time.strftime("%Y-%m-%dT%H:%M:%S.999")
-
-                query = """
-                SELECT
-                    f.id as frame_id,
-                    f.createdAt as created_at,
-                    f.segmentId as segment_id,
-                    f.imageFileName as image_file,
-                    s.bundleID as app_name,
-                    s.windowName as window_name
-                FROM
-                    frame f
-                LEFT JOIN
-                    segment s ON f.segmentId = s.id
-                WHERE
-                    f.createdAt BETWEEN ? AND ?
-                ORDER BY
-                    f.createdAt DESC
-                LIMIT ?
-                """
-
-                self.cursor.execute(query, (start_timestamp, end_timestamp, limit))
-                rows = self.cursor.fetchall()
-
-            results = []
-            for row in rows:
-                # check if the timestamp is a string or an integer
-                if isinstance(row[1], str):
-                    # parse the timestamp from the text format
-                    try:
-                        frame_time = datetime.datetime.strptime(row[1], "%Y-%m-%dT%H:%M:%S.%f")
-                    except ValueError:
-                        # try without microseconds
-                        frame_time = datetime.datetime.strptime(row[1], "%Y-%m-%dT%H:%M:%S")
-                else:
-                    # use the existing _ms_to_datetime method
-                    frame_time = self._ms_to_datetime(row[1])
-
-                results.append({
-                    'frame_id': row[0],
-                    'frame_time': frame_time,
-                    'segment_id': row[2],
-                    'image_file': row[3],
-                    'application': row[4],
-                    'window': row[5]
-                })
+            # the bounds are in the column's storage format, and sqlite orders
+            # every integer before every string, so all matched rows share that
+            # format and the converter is picked once instead of per row
+            if isinstance(start_timestamp, str):
+                to_datetime = self._iso_to_datetime
+            else:
+                to_datetime = _ms_to_datetime
 
-            return results
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute(query, (start_timestamp, end_timestamp, limit))
+
+                for frame_id, created_at, segment_id, image_file, app_name, window_name in cursor:
+                    yield {
+                        'frame_id': frame_id,
+                        'frame_time': to_datetime(created_at),
+                        'segment_id': segment_id,
+                        'image_file': image_file,
+                        'application': app_name,
+                        'window': window_name
+                    }
+            finally:
+                cursor.close()
 
         except Exception as e:
-            logger.error(f"error in get_screenshots_absolute: {e}")
-            return []
+            logger.error(f"error in iter_screenshots_absolute: {e}")
 
     def get_screenshots_relative(self, days: int = 0, hours: int = 0,
                                 minutes: int = 0, seconds: int = 0,
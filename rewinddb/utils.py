@@ -5,6 +5,7 @@ this module provides helper functions for time conversions, data formatting,
 and other utility operations used by the rewinddb library.
 """
 
+import bisect
 import datetime
 import typing
 
@@ -20,7 +21,7 @@ def timestamp_to_datetime(timestamp_ms: int) -> datetime.datetime:
     """
 
     # Always return timezone-aware UTC datetimes to be consistent with other
-    # helpers like ``_ms_to_datetime`` in ``RewindDB``.
+    # helpers like ``_ms_to_datetime`` in ``rewinddb.core``.
     return datetime.datetime.fromtimestamp(
         timestamp_ms / 1000, tz=datetime.timezone.utc
     )
@@ -59,16 +60,17 @@ def format_transcript(transcript_data: typing.List[dict]) -> str:
     if not transcript_data:
         return "no transcript data available."
 
-    # group words by audio session
+    # group words by audio session, keeping sessions in order of first
+    # appearance; each word costs a single lookup
     sessions = {}
     for item in transcript_data:
-        audio_id = item['audio_id']
-        if audio_id not in sessions:
-            sessions[audio_id] = {
+        session = sessions.get(item['audio_id'])
+        if session is None:
+            session = sessions[item['audio_id']] = {
                 'start_time': item['audio_start_time'],
                 'words': []
             }
-        sessions[audio_id]['words'].append(item)
+        session['words'].append(item)
 
     # format each session
     result = []
@@ -103,18 +105,19 @@ def format_ocr_data(ocr_data: typing.List[dict]) -> str:
     if not ocr_data:
         return "no ocr data available."
 
-    # group by frame
+    # group by frame, keeping frames in order of first appearance; each node
+    # costs a single lookup
     frames = {}
     for item in ocr_data:
-        frame_id = item['frame_id']
-        if frame_id not in frames:
-            frames[frame_id] = {
+        frame = frames.get(item['frame_id'])
+        if frame is None:
+            frame = frames[item['frame_id']] = {
                 'time': item['frame_time'],
                 'application': item['application'],
                 'window': item['window'],
                 'nodes': []
             }
-        frames[frame_id]['nodes'].append({
+        frame['nodes'].append({
             'text_offset': item['text_offset'],
             'text_length': item['text_length']
         })
@@ -163,30 +166,18 @@ def group_results_by_time(results: typing.List[dict],
 
     # sort by timestamp
     sorted_results = sorted(results, key=lambda x: x[time_field])
+    times = [item[time_field] for item in sorted_results]
+    interval = datetime.timedelta(seconds=interval_seconds)
 
-    # group by interval
+    # each group runs from its first item up to interval_seconds later; the
+    # end of the group is found by binary search instead of comparing every
+    # item in python. a group always holds at least its first item
     groups = []
-    current_group = []
-    current_interval_start = None
-
-    for item in sorted_results:
-        item_time = item[time_field]
-
-        if current_interval_start is None:
-            # first item
-            current_interval_start = item_time
-            current_group = [item]
-        elif (item_time - current_interval_start).total_seconds() <= interval_seconds:
-            # within current interval
-            current_group.append(item)
-        else:
-            # new interval
-            groups.append(current_group)
-            current_interval_start = item_time
-            current_group = [item]
-
-    # add the last group if not empty
-    if current_group:
-        groups.append(current_group)
-
-    return groups
\ No newline at end of file
+    start = 0
+
+    while start < len(sorted_results):
+        end = max(bisect.bisect_right(times, times[start] + interval, start), start + 1)
+        groups.append(sorted_results[start:end])
+        start = end
+
+    return groups
@@ -32,13 +32,37 @@ examples:
 """
 
 import argparse
+import contextlib
 import datetime
 from datetime import timezone
+import functools
+import json
 import re
 import sys
 
-import rewinddb
-import rewinddb.utils
+# relative time amounts, e.g. "5h", "2 weeks" or "1 hour 30 mins", compiled
+# once for parse_relative_time. the named group that matched gives the unit.
+# a number must start its own word, so "1.5h" or "1h30m" is rejected rather
+# than read as 5 hours or 30 minutes
+_TIME_RE = re.compile(
+    r"(?<![\w.])(\d+)\s*(?:"
+    r"(?P<weeks>weeks?|w)|"
+    r"(?P<days>days?|d)|"
+    r"(?P<hours>hours?|hrs?|h)|"
+    r"(?P<minutes>minutes?|mins?|m)|"
+    r"(?P<seconds>seconds?|secs?|s)"
+    r")\b"
+)
+
+# the time at the start of a searchRanking_content c1 value, e.g.
+# "Mon May 12 01:02:03 PM UTC: ...", compiled once for _parse_timestamp_info
+_TIMESTAMP_INFO_RE = re.compile(r"^\s*(.+?)\s*UTC:", re.DOTALL)
+
+# audio matches at most this many words apart share one context block
+_MATCH_GAP = 10
+
+# where rewind keeps its recordings, in YYYYMM/DD subdirectories
+_CHUNKS_DIR = "~/Library/Application Support/com.memoryvault.MemoryVault/chunks"
 
 
 def convert_to_local_time(dt):
@@ -78,59 +102,31 @@ def parse_relative_time(time_str):
     time_str = time_str.lower().strip()
     time_components = {"days": 0, "hours": 0, "minutes": 0, "seconds": 0}
 
-    # short form pattern (e.g., "5h", "3m", "10d", "2w")
-    short_patterns = {
-        r"^(\d+)w$": lambda x: {"days": int(x) * 7},
-        r"^(\d+)d$": lambda x: {"days": int(x)},
-        r"^(\d+)h$": lambda x: {"hours": int(x)},
-        r"^(\d+)m$": lambda x: {"minutes": int(x)},
-        r"^(\d+)s$": lambda x: {"seconds": int(x)}
-    }
-
-    # check for short form patterns first
-    for pattern, handler in short_patterns.items():
-        match = re.search(pattern, time_str)
-        if match:
-            component_values = handler(match.group(1))
-            for component, value in component_values.items():
-                time_components[component] = value
-            return time_components
-
-    # long form patterns
-    patterns = {
-        r"(\d+)\s*(?:day|days)": "days",
-        r"(\d+)\s*(?:hour|hours|hr|hrs)": "hours",
-        r"(\d+)\s*(?:minute|minutes|min|mins)": "minutes",
-        r"(\d+)\s*(?:second|seconds|sec|secs)": "seconds",
-        r"(\d+)\s*(?:week|weeks)": "weeks"
-    }
-
-    # try to match each pattern
-    found_match = False
-    for pattern, component in patterns.items():
-        match = re.search(pattern, time_str)
-        if match:
-            if component == "weeks":
-                time_components["days"] += int(match.group(1)) * 7
-            else:
-                time_components[component] = int(match.group(1))
-            found_match = True
+    # short and long forms are matched in a single scan. the first amount
+    # given for each unit is used
+    found = {}
+    for match in _TIME_RE.finditer(time_str):
+        found.setdefault(match.lastgroup, int(match.group(1)))
 
-    if not found_match:
+    if not found:
         raise ValueError(f"invalid time format: {time_str}. use format like '1 hour', '5h', '30m', '2d', '1w'.")
 
+    weeks = found.pop("weeks", 0)
+    time_components.update(found)
+    time_components["days"] += weeks * 7
+
     return time_components
 
 
-def search_with_relative_time(db, keyword, time_str, context=100, debug=False):
+def search_with_relative_time(db, keyword, time_str, debug=False, limit=None):
     """search for keywords with a relative time period.
 
     args:
         db: rewinddb instance
         keyword: search keyword
         time_str: relative time string (e.g., "1 hour", "5 hours")
-        context: number of words to show before/after audio hits (default: 100)
         debug: whether to print debug information
+        limit: maximum number of audio word matches (default: no limit)
 
     returns:
         dictionary with 'audio' and 'screen' keys containing search results
@@ -154,13 +150,13 @@ def search_with_relative_time(db, keyword, time_str, context=100, debug=False):
         if debug:
             print(f"debug: searching {days:.2f} days back")
 
-        return db.search(keyword, days=days)
+        return db.search(keyword, days=days, limit=limit)
     except ValueError as e:
         print(f"error: {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def search_with_absolute_time(db, keyword, from_time_str, to_time_str, debug=False):
+def search_with_absolute_time(db, keyword, from_time_str, to_time_str, debug=False, limit=None):
     """search for keywords within a specific time range.
 
     args:
@@ -169,16 +165,21 @@ def search_with_absolute_time(db, keyword, from_time_str, to_time_str, debug=Fal
         from_time_str: start time string in format "YYYY-MM-DD HH:MM:SS", "YYYY-MM-DD HH:MM", "HH:MM:SS", or "HH:MM"
         to_time_str: end time string in format "YYYY-MM-DD HH:MM:SS", "YYYY-MM-DD HH:MM", "HH:MM:SS", or "HH:MM"
         debug: whether to print debug information
+        limit: maximum number of audio word matches (default: no limit)
 
     returns:
         dictionary with 'audio' and 'screen' keys containing search results
     """
 
+    # read the clock once, so both ends of the range use the same date and
+    # timezone even when the search starts just before midnight
+    now = datetime.datetime.now().astimezone()
+    today = now.date().isoformat()
+
     def normalize_time_string(time_str):
         """normalize time string to handle both HH:MM and HH:MM:SS formats."""
         # check if time_str is time-only format (HH:MM or HH:MM:SS)
         if len(time_str) <= 8 and ':' in time_str:
-            today = datetime.datetime.now().strftime("%Y-%m-%d")
             # if it's HH:MM format, add :00 for seconds
             if time_str.count(':') == 1:
                 time_str = f"{time_str}:00"
@@ -191,7 +192,7 @@ def search_with_absolute_time(db, keyword, from_time_str, to_time_str, debug=Fal
 
     try:
         # get local timezone for proper conversion
-        local_tz = datetime.datetime.now().astimezone().tzinfo
+        local_tz = now.tzinfo
 
         # normalize time strings to handle HH:MM format
         from_time_str = normalize_time_string(from_time_str)
@@ -208,36 +209,164 @@ def search_with_absolute_time(db, keyword, from_time_str, to_time_str, debug=Fal
         if debug:
             print(f"debug: searching for '{keyword}' from {from_time} to {to_time}")
 
-        # Use the search method with the absolute time range
-        # Convert the absolute time range to days for the search method
-        days = (to_time - from_time).total_seconds() / 86400
-
-        if debug:
-            print(f"debug: calculated {days:.2f} days between {from_time} and {to_time}")
-
-        # Get search results using the search method
-        results = db.search(keyword, days=days)
-
-        # Filter results to only include those within the specified time range
-        audio_results = []
-        for item in results['audio']:
-            if from_time <= item['absolute_time'] <= to_time:
-                audio_results.append(item)
-
-        screen_results = []
-        for item in results['screen']:
-            if from_time <= item['frame_time'] <= to_time:
-                screen_results.append(item)
-
-        return {
-            'audio': audio_results,
-            'screen': screen_results
-        }
+        # bind the absolute range straight into the search queries
+        return db.search(keyword, start_time=from_time, end_time=to_time, limit=limit)
     except ValueError as e:
         print(f"error: invalid time format. use format 'YYYY-MM-DD HH:MM:SS', 'YYYY-MM-DD HH:MM', 'HH:MM:SS', or 'HH:MM'.", file=sys.stderr)
         sys.exit(1)
 
 
+def _format_timestamp(dt):
+    """format a datetime as YYYY-MM-DD HH:MM:SS.
+
+    builds the string from the integer fields, which is cheaper than strftime
+    for the per-result formatting below.
+
+    args:
+        dt: datetime object to format
+
+    returns:
+        formatted timestamp string
+    """
+
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+
+def _epoch_minute(dt):
+    """get the minute since the epoch of a datetime, the screen dedup key.
+
+    naive datetimes are taken as local time, as timestamp() does, so an
+    estimated time and a converted frame time for the same minute match.
+
+    args:
+        dt: datetime object, or none
+
+    returns:
+        minute since the epoch, or none when there is no datetime
+    """
+
+    return int(dt.timestamp() // 60) if dt else None
+
+
+def _recording_path(dt):
+    """build the rewind chunks directory holding recordings from a given day.
+
+    args:
+        dt: datetime of the recording
+
+    returns:
+        path of the day's chunks directory
+    """
+
+    return f"{_CHUNKS_DIR}/{dt.year:04d}{dt.month:02d}/{dt.day:02d}"
+
+
+def _parse_frame_created_at(created_at):
+    """convert a frame.createdAt value to a naive local datetime.
+
+    args:
+        created_at: milliseconds since epoch or an iso formatted string
+
+    returns:
+        datetime object for the frame
+    """
+
+    if isinstance(created_at, int):
+        # convert milliseconds to datetime
+        return datetime.datetime.fromtimestamp(created_at / 1000)
+
+    # parse iso format; fromisoformat handles the value with or without
+    # fractional seconds, strptime is only left for strings it rejects
+    try:
+        return datetime.datetime.fromisoformat(created_at)
+    except ValueError:
+        try:
+            return datetime.datetime.strptime(created_at, "%Y-%m-%dT%H:%M:%S.%f")
+        except ValueError:
+            return datetime.datetime.strptime(created_at, "%Y-%m-%dT%H:%M:%S")
+
+
+@functools.lru_cache(maxsize=2048)
+def _parse_timestamp_info(timestamp_info, year):
+    """parse the time in a searchRanking_content c1 value.
+
+    the value starts with a time like "Mon May 12 01:02:03 PM UTC: ...",
+    which carries no year, so the given one is used. results are cached,
+    since duplicate rows repeat the same value.
+
+    args:
+        timestamp_info: the c1 value
+        year: year to place the time in
+
+    returns:
+        datetime object, or none if there is no parsable time
+    """
+
+    if not isinstance(timestamp_info, str):
+        timestamp_info = str(timestamp_info)
+
+    match = _TIMESTAMP_INFO_RE.match(timestamp_info)
+    if match is None:
+        return None
+
+    try:
+        date_obj = datetime.datetime.strptime(match.group(1), "%a %b %d %I:%M:%S %p")
+        return date_obj.replace(year=year)
+    except ValueError:
+        return None
+
+
+def _group_audio_sessions(results):
+    """group audio search rows by recording, keeping one row per word.
+
+    matches close together share context, so the same word can come back
+    once per match; the row that marks it as a match is the one kept.
+
+    args:
+        results: list of audio transcript dictionaries
+
+    returns:
+        dict of audio id to a session with its start time and its words
+        sorted by time offset
+    """
+
+    sessions = {}
+    for item in results:
+        session = sessions.get(item['audio_id'])
+        if session is None:
+            session = sessions[item['audio_id']] = {
+                'start_time': item['audio_start_time'],
+                'words': {}
+            }
+        words = session['words']
+        seen = words.get(item['word_id'])
+        if seen is None or (item.get('is_match', False) and not seen.get('is_match', False)):
+            words[item['word_id']] = item
+
+    for session in sessions.values():
+        session['words'] = sorted(session['words'].values(), key=lambda x: x['time_offset'])
+    return sessions
+
+
+def audio_match_records(results, context=100):
+    """get one record per audio match, with the words around it as text.
+
+    args:
+        results: list of audio transcript dictionaries
+        context: number of words to include before/after the hit (default: 100)
+
+    returns:
+        iterator of match dictionaries with an added 'context' string
+    """
+
+    for session in _group_audio_sessions(results).values():
+        words = session['words']
+        for i, word in enumerate(words):
+            if word.get('is_match', False):
+                context_words = words[max(0, i - context):i + context + 1]
+                yield {**word, 'context': " ".join(w['word'] for w in context_words)}
+
+
 def format_audio_results(results, context=100, use_utc=False):
     """format audio search results with context.
 
@@ -249,25 +378,30 @@ def format_audio_results(results, context=100, use_utc=False):
         formatted string representation of the results
     """
 
-    if not results:
-        return "no audio matches found."
+    return "\n".join(format_audio_lines(results, context, use_utc))
 
-    # group words by audio session first
-    sessions = {}
-    for item in results:
-        audio_id = item['audio_id']
-        if audio_id not in sessions:
-            sessions[audio_id] = {
-                'start_time': item['audio_start_time'],
-                'words': []
-            }
-        sessions[audio_id]['words'].append(item)
+
+def format_audio_lines(results, context=100, use_utc=False):
+    """format audio search results with context, one output line at a time.
+
+    lines are produced as each session is formatted, so they can be written
+    out without first building the whole text.
+
+    args:
+        results: list of audio transcript dictionaries
+        context: number of words to show before/after the hit (default: 100)
+
+    returns:
+        iterator of formatted lines
+    """
+
+    if not results:
+        yield "no audio matches found."
+        return
 
     # format each session with context
-    formatted_results = []
-    for audio_id, session in sessions.items():
-        # sort all words by time offset
-        all_words = sorted(session['words'], key=lambda x: x['time_offset'])
+    for audio_id, session in _group_audio_sessions(results).items():
+        all_words = session['words']
 
         # find all match words
         match_indices = [i for i, word in enumerate(all_words) if word.get('is_match', False)]
@@ -275,16 +409,16 @@ def format_audio_results(results, context=100, use_utc=False):
         if not match_indices:
             continue  # skip sessions with no matches
 
-        start_time = session['start_time'].strftime('%Y-%m-%d %H:%M:%S')
-        formatted_results.append(f"[{start_time}] Audio Match:")
+        start_time = _format_timestamp(session['start_time'])
+        yield f"[{start_time}] Audio Match:"
 
         # group consecutive matches together
         match_groups = []
         current_group = [match_indices[0]]
 
         for i in range(1, len(match_indices)):
-            # if matches are close together (within 10 words), group them
-            if match_indices[i] - match_indices[i-1] <= 10:
+            # if matches are close together (within _MATCH_GAP words), group them
+            if match_indices[i] - match_indices[i-1] <= _MATCH_GAP:
                 current_group.append(match_indices[i])
             else:
                 match_groups.append(current_group)
@@ -300,30 +434,18 @@ def format_audio_results(results, context=100, use_utc=False):
             start_idx = max(0, first_match - context)
             end_idx = min(len(all_words), last_match + context + 1)
 
-            # get the context words
-            context_words = all_words[start_idx:end_idx]
-
-            # format the context
-            word_texts = []
-            for word in context_words:
-                if word.get('is_match', False):
-                    # highlight match words
-                    word_texts.append(f"{word['word']}")
-                else:
-                    word_texts.append(word['word'])
-
-            context_text = " ".join(word_texts)
+            # join the context words; matches are printed the same as the
+            # words around them
+            context_text = " ".join(word['word'] for word in all_words[start_idx:end_idx])
 
             # only add ellipsis if we actually truncated content
             prefix = "..." if start_idx > 0 else ""
             suffix = "..." if end_idx < len(all_words) else ""
 
             # add the context to the results
-            formatted_results.append(f"  {prefix}{context_text}{suffix}")
-
-        formatted_results.append("")  # empty line between sessions
+            yield f"  {prefix}{context_text}{suffix}"
 
-    return "\n".join(formatted_results)
+        yield ""  # empty line between sessions
 
 
 def estimate_timestamp_from_content_id(content_id, reference_date=None):
@@ -371,42 +493,118 @@ def estimate_timestamp_from_content_id(content_id, reference_date=None):
         return None
 
 
-def format_screen_results(results, use_utc=False):
+def fetch_rows_by_id(cursor, table, column, ids):
+    """fetch one column for many row ids in batched queries.
+
+    args:
+        cursor: database cursor to query with
+        table: table to read from, keyed by its id column
+        column: column to fetch
+        ids: row ids to look up
+
+    returns:
+        dict mapping each id found to a (value,) row
+    """
+
+    rows = {}
+
+    # stay under sqlite's default limit of 999 bound parameters per statement
+    for start in range(0, len(ids), 900):
+        chunk = ids[start:start + 900]
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(f"SELECT id, {column} FROM {table} WHERE id IN ({placeholders})", chunk)
+        for row in cursor.fetchall():
+            rows[row[0]] = (row[1],)
+
+    return rows
+
+
+def format_screen_results(results, use_utc=False, db=None):
     """format screen ocr search results.
 
     args:
         results: list of screen ocr dictionaries
         use_utc: whether to display times in UTC (default: False for local time)
+        db: open rewinddb instance to look up timestamps with (default: open a
+            separate connection)
 
     returns:
         formatted string representation of the results
     """
 
-    if not results:
-        return "no screen matches found."
+    return "\n".join(format_screen_lines(results, use_utc, db))
 
-    # format each result
-    formatted_results = []
-    seen_display_hashes = set()  # Track seen display combinations to avoid duplicates
 
-    # create a database connection for looking up timestamps
-    try:
-        from rewinddb.config import get_db_path, get_db_password
-        import pysqlcipher3.dbapi2 as sqlite3
+def format_screen_lines(results, use_utc=False, db=None):
+    """format screen ocr search results, one output line at a time.
+
+    lines are produced as each result is formatted, so they can be written
+    out without first building the whole text.
+
+    args:
+        results: list of screen ocr dictionaries
+        use_utc: whether to display times in UTC (default: False for local time)
+        db: open rewinddb instance to look up timestamps with (default: open a
+            separate connection)
 
-        db_path = get_db_path()
-        db_password = get_db_password()
+    returns:
+        iterator of formatted lines
+    """
 
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+    if not results:
+        yield "no screen matches found."
+        return
 
-        # configure the connection for the encrypted database
-        cursor.execute(f"PRAGMA key = '{db_password}'")
-        cursor.execute("PRAGMA cipher_compatibility = 4")
+    # format each result
+    seen_display_hashes = set()  # Track seen (minute, app) combinations to avoid duplicates
 
+    # look up timestamps on the caller's connection when there is one, since
+    # keying a new sqlcipher connection runs the full key derivation again
+    owns_connection = db is None
+    if not owns_connection:
+        cursor = db.conn.cursor()
         db_connection_available = True
-    except Exception as e:
-        db_connection_available = False
+    else:
+        # create a database connection for looking up timestamps
+        try:
+            from rewinddb.config import get_db_path, get_db_password
+            import pysqlcipher3.dbapi2 as sqlite3
+
+            db_path = get_db_path()
+            db_password = get_db_password()
+
+            conn = sqlite3.connect(db_path)
+            cursor = conn.cursor()
+
+            # configure the connection for the encrypted database
+            escaped_password = db_password.replace("'", "''")
+            cursor.execute(f"PRAGMA key = '{escaped_password}'")
+            cursor.execute("PRAGMA cipher_compatibility = 4")
+
+            db_connection_available = True
+        except Exception as e:
+            db_connection_available = False
+
+    # look up the timestamps of every content id in two batched queries
+    # instead of one or two queries per result
+    frame_rows = {}
+    ranking_rows = {}
+    lookup_error = None
+    if db_connection_available:
+        content_ids = list({item['content_id'] for item in results
+                            if item.get('text') and item.get('content_id')})
+        try:
+            frame_rows = fetch_rows_by_id(cursor, "frame", "createdAt", content_ids)
+            ranking_rows = fetch_rows_by_id(cursor, "searchRanking_content", "c1",
+                                            [content_id for content_id in content_ids if content_id not in frame_rows])
+        except Exception as e:
+            lookup_error = e
+        finally:
+            # every lookup is done up front, so the cursor, and a connection
+            # opened here, are not held while the results are written out
+            cursor.close()
+            if owns_connection:
+                conn.close()
 
     for item in results:
         # handle results from searchRanking_content
@@ -416,17 +614,9 @@ def format_screen_results(results, use_utc=False):
             if 'frame_time' in item and item['frame_time']:
                 timestamp = item['frame_time']
             elif 'timestamp_info' in item and item['timestamp_info']:
-                # try to extract timestamp from timestamp_info
-                timestamp_str = str(item['timestamp_info'])
-                if "UTC:" in timestamp_str:
-                    timestamp_str = timestamp_str.split("UTC:")[0].strip()
-                    try:
-                        timestamp = datetime.datetime.strptime(timestamp_str, "%a %b %d %I:%M:%S %p")
-                        # add current year since it's missing
-                        current_year = datetime.datetime.now().year
-                        timestamp = timestamp.replace(year=current_year)
-                    except:
-                        pass
+                # try to extract timestamp from timestamp_info, adding the
+                # current year since it's missing
+                timestamp = _parse_timestamp_info(item['timestamp_info'], datetime.datetime.now().year)
 
             # format the timestamp
             # try to estimate timestamp from content_id if not available
@@ -436,8 +626,6 @@ def format_screen_results(results, use_utc=False):
                     timestamp = estimated_timestamp
                     item['frame_time'] = timestamp
 
-            time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S') if timestamp else "Unknown time"
-
             # get application and window info
             app_str = ""
             if 'application' in item and item['application'] and 'window' in item and item['window']:
@@ -447,212 +635,92 @@ def format_screen_results(results, use_utc=False):
             else:
                 app_str = "Unknown application"
 
-            # create a display hash to avoid duplicate display lines
-            # round timestamp to nearest minute for better deduplication
-            if timestamp:
-                rounded_time = timestamp.replace(second=0, microsecond=0)
-                rounded_time_str = rounded_time.strftime('%Y-%m-%d %H:%M')
-            else:
-                rounded_time_str = "Unknown time"
-
-            display_hash = f"{rounded_time_str}_{app_str}"
+            # create a display key to avoid duplicate display lines
+            # round timestamp to the minute for better deduplication
+            display_hash = (_epoch_minute(timestamp), app_str)
 
             # skip if we've already shown this exact timestamp/app combination
             if display_hash in seen_display_hashes:
                 continue
             seen_display_hashes.add(display_hash)
 
-            # add the formatted result
-            formatted_results.append(f"[{time_str}] Screen Match in {app_str}")
+            # add the formatted result; the time is only formatted for the
+            # results that are kept
+            time_str = _format_timestamp(timestamp) if timestamp else "Unknown time"
+            yield f"[{time_str}] Screen Match in {app_str}"
 
             # add the text content with more context
             text_content = item['text']
-            formatted_results.append(f"  Text: {text_content}")
+            yield f"  Text: {text_content}"
 
             # construct recording path based on content ID
             if 'content_id' in item and item['content_id']:
                 content_id = item['content_id']
 
-                # Query the database to get the frame.createdAt for this content_id
+                # Look up the frame.createdAt for this content_id
                 if db_connection_available:
+                    # Most recent content IDs are likely to be from the current date
+                    current_date = datetime.datetime.now()
+
                     try:
-                        # Try to determine the date from the content ID itself
-                        # Most recent content IDs are likely to be from the current date
-                        current_date = datetime.datetime.now()
-                        year_month = current_date.strftime("%Y%m")
-                        day = current_date.strftime("%d")
-
-                        # extract timestamp from content_id
-                        # content ids are typically sequential and can be used to estimate time
-                        # newer content ids are higher numbers
-                        estimated_timestamp = None
-
-                        # first try to query the frame table
-                        cursor.execute("""
-                            SELECT
-                                createdAt
-                            FROM
-                                frame
-                            WHERE
-                                id = ?
-                        """, (content_id,))
-
-                        result = cursor.fetchone()
-                        if result:
-                            created_at = result[0]
-
-                            # parse the timestamp
-                            if isinstance(created_at, int):
-                                # convert milliseconds to datetime
-                                frame_time = datetime.datetime.fromtimestamp(created_at / 1000)
-                                # update the item's timestamp
-                                item['frame_time'] = frame_time
-                                # update the time_str that will be displayed
-                                time_str = frame_time.strftime('%Y-%m-%d %H:%M:%S')
-                            else:
-                                # parse iso format
-                                try:
-                                    frame_time = datetime.datetime.strptime(created_at, "%Y-%m-%dT%H:%M:%S.%f")
-                                except ValueError:
-                                    frame_time = datetime.datetime.strptime(created_at, "%Y-%m-%dT%H:%M:%S")
-                                # update the item's timestamp
-                                item['frame_time'] = frame_time
-                                # update the time_str that will be displayed
-                                time_str = frame_time.strftime('%Y-%m-%d %H:%M:%S')
-
-                            # construct recording path
-                            year_month = frame_time.strftime("%Y%m")
-                            day = frame_time.strftime("%d")
-                            recording_path = f"~/Library/Application Support/com.memoryvault.MemoryVault/chunks/{year_month}/{day}"
-
-                            formatted_results.append(f"  Recording path: {recording_path}")
-                            formatted_results.append(f"  Timestamp: {frame_time.strftime('%Y-%m-%d %H:%M:%S')}")
+                        # the frame and searchRanking_content rows were all
+                        # fetched up front; a failed lookup is reported here
+                        if lookup_error is not None:
+                            raise lookup_error
+
+                        # first try the frame table, then the time recorded
+                        # in searchRanking_content
+                        frame_row = frame_rows.get(content_id)
+                        if frame_row:
+                            frame_time = _parse_frame_created_at(frame_row[0])
+                            label = "Timestamp"
                         else:
-                            # if no direct match in frame table, try to use the content id to estimate the date
-                            # check if the content id is in searchranking_content
-                            cursor.execute("""
-                                SELECT
-                                    c1
-                                FROM
-                                    searchRanking_content
-                                WHERE
-                                    id = ?
-                            """, (content_id,))
-
-                            result = cursor.fetchone()
-                            if result and result[0]:
-                                # try to extract date from c1
-                                timestamp_str = str(result[0])
-                                if "UTC:" in timestamp_str:
-                                    timestamp_parts = timestamp_str.split("UTC:")
-                                    if len(timestamp_parts) > 0:
-                                        date_part = timestamp_parts[0].strip()
-                                        try:
-                                            date_obj = datetime.datetime.strptime(date_part, "%a %b %d %I:%M:%S %p")
-                                            # add current year
-                                            date_obj = date_obj.replace(year=current_date.year)
-
-                                            # update the item's timestamp
-                                            item['frame_time'] = date_obj
-                                            # update the time_str that will be displayed
-                                            time_str = date_obj.strftime('%Y-%m-%d %H:%M:%S')
-
-                                            # construct recording path
-                                            year_month = date_obj.strftime("%Y%m")
-                                            day = date_obj.strftime("%d")
-                                            recording_path = f"~/Library/Application Support/com.memoryvault.MemoryVault/chunks/{year_month}/{day}"
-
-                                            formatted_results.append(f"  Recording path: {recording_path}")
-                                            formatted_results.append(f"  Timestamp (estimated): {date_obj.strftime('%Y-%m-%d %H:%M:%S')}")
-                                        except Exception as e:
-                                            # use current date as fallback
-                                            # estimate timestamp from content id
-                                            estimated_timestamp = estimate_timestamp_from_content_id(content_id, current_date)
-                                            if estimated_timestamp:
-                                                item['frame_time'] = estimated_timestamp
-                                                time_str = estimated_timestamp.strftime('%Y-%m-%d %H:%M:%S')
-                                                year_month = estimated_timestamp.strftime("%Y%m")
-                                                day = estimated_timestamp.strftime("%d")
-                                            else:
-                                                year_month = current_date.strftime("%Y%m")
-                                                day = current_date.strftime("%d")
-
-                                            recording_path = f"~/Library/Application Support/com.memoryvault.MemoryVault/chunks/{year_month}/{day}"
-                                            formatted_results.append(f"  Recording path (estimated): {recording_path}")
-                                            formatted_results.append(f"  Content ID: {content_id}")
-                                    else:
-                                        # estimate timestamp from content id
-                                        estimated_timestamp = estimate_timestamp_from_content_id(content_id, current_date)
-                                        if estimated_timestamp:
-                                            item['frame_time'] = estimated_timestamp
-                                            time_str = estimated_timestamp.strftime('%Y-%m-%d %H:%M:%S')
-                                            year_month = estimated_timestamp.strftime("%Y%m")
-                                            day = estimated_timestamp.strftime("%d")
-                                        else:
-                                            year_month = current_date.strftime("%Y%m")
-                                            day = current_date.strftime("%d")
-
-                                        recording_path = f"~/Library/Application Support/com.memoryvault.MemoryVault/chunks/{year_month}/{day}"
-                                        formatted_results.append(f"  Recording path (estimated): {recording_path}")
-                                        formatted_results.append(f"  Content ID: {content_id}")
-                                else:
-                                    # estimate timestamp from content id
-                                    estimated_timestamp = estimate_timestamp_from_content_id(content_id, current_date)
-                                    if estimated_timestamp:
-                                        item['frame_time'] = estimated_timestamp
-                                        time_str = estimated_timestamp.strftime('%Y-%m-%d %H:%M:%S')
-                                        year_month = estimated_timestamp.strftime("%Y%m")
-                                        day = estimated_timestamp.strftime("%d")
-                                    else:
-                                        year_month = current_date.strftime("%Y%m")
-                                        day = current_date.strftime("%d")
-
-                                    recording_path = f"~/Library/Application Support/com.memoryvault.MemoryVault/chunks/{year_month}/{day}"
-                                    formatted_results.append(f"  Recording path (estimated): {recording_path}")
-                                    formatted_results.append(f"  Content ID: {content_id}")
+                            ranking_row = ranking_rows.get(content_id)
+                            if ranking_row and ranking_row[0]:
+                                frame_time = _parse_timestamp_info(ranking_row[0], current_date.year)
                             else:
-                                # estimate timestamp from content id
-                                estimated_timestamp = estimate_timestamp_from_content_id(content_id, current_date)
-                                if estimated_timestamp:
-                                    item['frame_time'] = estimated_timestamp
-                                    time_str = estimated_timestamp.strftime('%Y-%m-%d %H:%M:%S')
-                                    year_month = estimated_timestamp.strftime("%Y%m")
-                                    day = estimated_timestamp.strftime("%d")
-                                else:
-                                    year_month = current_date.strftime("%Y%m")
-                                    day = current_date.strftime("%d")
-
-                                recording_path = f"~/Library/Application Support/com.memoryvault.MemoryVault/chunks/{year_month}/{day}"
-                                formatted_results.append(f"  Recording path (estimated): {recording_path}")
-                                formatted_results.append(f"  Content ID: {content_id}")
+                                frame_time = None
+                            label = "Timestamp (estimated)"
                     except Exception as e:
                         # fallback if there's an error
-                        # estimate timestamp from content id
                         estimated_timestamp = estimate_timestamp_from_content_id(content_id, current_date)
                         if estimated_timestamp:
                             item['frame_time'] = estimated_timestamp
-                            time_str = estimated_timestamp.strftime('%Y-%m-%d %H:%M:%S')
 
-                        formatted_results.append(f"  Content ID: {content_id}")
-                        formatted_results.append(f"  Note: error retrieving frame timestamp: {str(e)}")
+                        yield f"  Content ID: {content_id}"
+                        yield f"  Note: error retrieving frame timestamp: {str(e)}"
+                    else:
+                        if frame_time:
+                            item['frame_time'] = frame_time
+                            yield f"  Recording path: {_recording_path(frame_time)}"
+                            yield f"  {label}: {_format_timestamp(frame_time)}"
+                        else:
+                            # estimate timestamp from content id, or use the
+                            # current date for the path when that fails too
+                            estimated_timestamp = estimate_timestamp_from_content_id(content_id, current_date)
+                            if estimated_timestamp:
+                                item['frame_time'] = estimated_timestamp
+
+                            yield f"  Recording path (estimated): {_recording_path(estimated_timestamp or current_date)}"
+                            yield f"  Content ID: {content_id}"
                 else:
                     # If database connection is not available
-                    formatted_results.append(f"  Content ID: {content_id}")
-                    formatted_results.append("  Note: Database connection not available for timestamp lookup")
+                    yield f"  Content ID: {content_id}"
+                    yield "  Note: Database connection not available for timestamp lookup"
 
-            formatted_results.append("")  # empty line between results
+            yield ""  # empty line between results
 
         # handle results from traditional search
         elif 'frame_id' in item:
             # try to get timestamp from frame_time
             if 'frame_time' in item and item['frame_time']:
-                time_str = item['frame_time'].strftime('%Y-%m-%d %H:%M:%S')
+                time_str = _format_timestamp(item['frame_time'])
             else:
                 # try to estimate timestamp from frame_id
                 estimated_timestamp = estimate_timestamp_from_content_id(item['frame_id'])
                 if estimated_timestamp:
                     item['frame_time'] = estimated_timestamp
-                    time_str = estimated_timestamp.strftime('%Y-%m-%d %H:%M:%S')
+                    time_str = _format_timestamp(estimated_timestamp)
                 else:
                     time_str = "Unknown time"
 
@@ -660,47 +728,30 @@ def format_screen_results(results, use_utc=False):
             if 'application' in item and item['application'] and 'window' in item and item['window']:
                 app_str = f"{item['application']} - {item['window']}"
 
-            # create a display hash to avoid duplicate display lines
-            # round timestamp to nearest minute for better deduplication
-            if 'frame_time' in item and item['frame_time']:
-                rounded_time = item['frame_time'].replace(second=0, microsecond=0)
-                rounded_time_str = rounded_time.strftime('%Y-%m-%d %H:%M')
-            else:
-                rounded_time_str = "Unknown time"
-
-            display_hash = f"{rounded_time_str}_{app_str}"
+            # create a display key to avoid duplicate display lines
+            # round timestamp to the minute for better deduplication
+            display_hash = (_epoch_minute(item.get('frame_time')), app_str)
 
             # skip if we've already shown this exact timestamp/app combination
             if display_hash in seen_display_hashes:
                 continue
             seen_display_hashes.add(display_hash)
 
-            formatted_results.append(f"[{time_str}] Screen Match in {app_str}")
+            yield f"[{time_str}] Screen Match in {app_str}"
 
             # construct recording path based on frame ID
             if 'frame_id' in item and item['frame_time']:
                 frame_id = item['frame_id']
                 timestamp = item['frame_time']
 
-                # Construct recording path
-                year_month = timestamp.strftime("%Y%m")
-                day = timestamp.strftime("%d")
-                recording_path = f"~/Library/Application Support/com.memoryvault.MemoryVault/chunks/{year_month}/{day}"
-
-                formatted_results.append(f"  Recording path: {recording_path}")
-                formatted_results.append(f"  Timestamp: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
+                yield f"  Recording path: {_recording_path(timestamp)}"
+                yield f"  Timestamp: {_format_timestamp(timestamp)}"
             elif 'frame_id' in item:
                 # Fallback if timestamp is not available
-                formatted_results.append(f"  Frame ID: {item['frame_id']}")
-                formatted_results.append("  Note: No timestamp available for this frame")
-
-            formatted_results.append("")  # empty line between results
-
-    # Close the database connection if it was opened
-    if db_connection_available:
-        conn.close()
+                yield f"  Frame ID: {item['frame_id']}"
+                yield "  Note: No timestamp available for this frame"
 
-    return "\n".join(formatted_results)
+            yield ""  # empty line between results
 
 
 def parse_arguments():
@@ -729,6 +780,8 @@ examples:
   %(prog)s "meeting" --utc  # display times in UTC instead of local time
   %(prog)s "code" --audio  # search only in audio transcripts
   %(prog)s "menu" --visual  # search only in screen OCR data
+  %(prog)s "meeting" --json > matches.jsonl  # one JSON object per match
+  %(prog)s "meeting" --check-index  # rebuild the search index after words were edited
 """
     )
 
@@ -743,9 +796,14 @@ examples:
                        help="end time in format 'YYYY-MM-DD HH:MM:SS', 'YYYY-MM-DD HH:MM', 'HH:MM:SS', or 'HH:MM' (uses today's date)")
     parser.add_argument("--context", type=int, default=100,
                        help="number of words to show before/after audio hits (default: 100)")
+    parser.add_argument("--limit", type=int, default=500,
+                       help="maximum number of audio hits to return (default: 500)")
     parser.add_argument("--debug", action="store_true", help="enable debug output")
     parser.add_argument("--env-file", metavar="FILE", help="path to .env file with database configuration")
     parser.add_argument("--utc", action="store_true", help="display times in UTC instead of local time")
+    parser.add_argument("--json", action="store_true", help="output matches as JSON, one object per line")
+    parser.add_argument("--check-index", action="store_true",
+                       help="rebuild the transcript search index first if words were deleted or edited since it was built (reads every word)")
 
     # Add source filter options
     source_group = parser.add_mutually_exclusive_group()
@@ -769,83 +827,122 @@ def main():
 
     args = parse_arguments()
 
-    try:
-        # connect to the database using rewinddb library
-        print("connecting to rewind database...")
-        with rewinddb.RewindDB(args.env_file) as db:
-            # search based on the specified time range
-            if args.relative:
-                print(f"searching for '{args.keyword}' in the last {args.relative}...")
-                results = search_with_relative_time(db, args.keyword, args.relative,
-                                                  args.context, args.debug)
-            elif args.from_time:
-                print(f"searching for '{args.keyword}' from {args.from_time} to {args.to_time}...")
-                results = search_with_absolute_time(db, args.keyword, args.from_time,
-                                                  args.to_time, args.debug)
-            else:
-                # default to 120 days if no time range specified
-                print(f"searching for '{args.keyword}' in the last 120 days...")
-                results = db.search(args.keyword, days=120)
-
-            # format and display results
-            audio_results = results['audio']
-            screen_results = results['screen']
-
-            # Filter results based on source options
-            if args.audio:
-                screen_results = []  # Only show audio results
-            elif args.visual:
-                audio_results = []  # Only show visual results
-
-            # Convert timestamps to local time if not using UTC
-            if not args.utc:
-                # Convert audio timestamps
-                for item in audio_results:
-                    if 'absolute_time' in item:
-                        item['absolute_time'] = convert_to_local_time(item['absolute_time'])
-                    if 'audio_start_time' in item:
-                        item['audio_start_time'] = convert_to_local_time(item['audio_start_time'])
-
-                # Convert screen timestamps
-                for item in screen_results:
-                    if 'frame_time' in item:
-                        item['frame_time'] = convert_to_local_time(item['frame_time'])
-
-            print(f"found {len(audio_results)} audio matches and {len(screen_results)} screen matches.")
-
-            if args.debug:
-                print(f"\ndebug: first few audio matches:")
-                for i, match in enumerate(audio_results[:3]):
-                    print(f"debug: match {i+1}: {match}")
-
-                print(f"\ndebug: first few screen matches:")
-                for i, match in enumerate(screen_results[:3]):
-                    print(f"debug: match {i+1}: {match}")
-
-            # display audio results
-            print("\naudio matches:")
-            formatted_audio = format_audio_results(audio_results, args.context, args.utc)
-            print(formatted_audio)
-
-            # display screen results
-            print("\nscreen matches:")
-            formatted_screen = format_screen_results(screen_results, args.utc)
-            print(formatted_screen)
-
-    except FileNotFoundError as e:
-        print(f"error: {e}", file=sys.stderr)
-        print("check your DB_PATH setting in .env file", file=sys.stderr)
-        sys.exit(1)
-    except ConnectionError as e:
-        print(f"error: {e}", file=sys.stderr)
-        print("check your DB_PASSWORD setting in .env file", file=sys.stderr)
-        sys.exit(1)
-    except Exception as e:
-        print(f"unexpected error: {e}", file=sys.stderr)
-        print(f"error type: {type(e).__name__}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    # the database library is only needed once there is something to search,
+    # so --help and usage errors don't pay for importing it
+    import rewinddb
+
+    # keep stdout to the matches themselves when writing json: everything
+    # else printed along the way, debug output included, goes to stderr
+    write = sys.stdout.write
+    status = sys.stderr if args.json else sys.stdout
+
+    with contextlib.redirect_stdout(status):
+        try:
+            # connect to the database using rewinddb library
+            print("connecting to rewind database...")
+            with rewinddb.RewindDB(args.env_file) as db:
+                if args.check_index:
+                    print("checking the transcript search index...")
+                    if db.verify_transcript_index():
+                        print("rebuilt the transcript search index")
+
+                # a screen-only search doesn't fetch any audio matches
+                audio_limit = 0 if args.visual else args.limit
+
+                # search based on the specified time range
+                if args.relative:
+                    print(f"searching for '{args.keyword}' in the last {args.relative}...")
+                    results = search_with_relative_time(db, args.keyword, args.relative,
+                                                      args.debug, limit=audio_limit)
+                elif args.from_time:
+                    print(f"searching for '{args.keyword}' from {args.from_time} to {args.to_time}...")
+                    results = search_with_absolute_time(db, args.keyword, args.from_time,
+                                                      args.to_time, args.debug, limit=audio_limit)
+                else:
+                    # default to 120 days if no time range specified
+                    print(f"searching for '{args.keyword}' in the last 120 days...")
+                    results = db.search(args.keyword, days=120, limit=audio_limit)
+
+                # format and display results
+                audio_results = results['audio']
+                screen_results = results['screen']
+
+                # Filter results based on source options
+                if args.audio:
+                    screen_results = []  # Only show audio results
+                elif args.visual:
+                    audio_results = []  # Only show visual results
+
+                # Convert timestamps to local time if not using UTC
+                if not args.utc:
+                    # Convert audio timestamps. the words of one recording share
+                    # its start time, so each distinct start is converted once
+                    local_start_times = {}
+                    for item in audio_results:
+                        if 'absolute_time' in item:
+                            item['absolute_time'] = convert_to_local_time(item['absolute_time'])
+                        if 'audio_start_time' in item:
+                            start_time = item['audio_start_time']
+                            local_start = local_start_times.get(start_time)
+                            if local_start is None:
+                                local_start = local_start_times[start_time] = convert_to_local_time(start_time)
+                            item['audio_start_time'] = local_start
+
+                    # Convert screen timestamps
+                    for item in screen_results:
+                        if 'frame_time' in item:
+                            item['frame_time'] = convert_to_local_time(item['frame_time'])
+
+                print(f"found {len(audio_results)} audio matches and {len(screen_results)} screen matches.")
+                if audio_results and sum(1 for item in audio_results if item.get('is_match')) >= args.limit:
+                    print(f"note: only the {args.limit} most recent audio hits are shown; use --limit to raise it")
+
+                if args.debug:
+                    print(f"\ndebug: first few audio matches:")
+                    for i, match in enumerate(audio_results[:3]):
+                        print(f"debug: match {i+1}: {match}")
+
+                    print(f"\ndebug: first few screen matches:")
+                    for i, match in enumerate(screen_results[:3]):
+                        print(f"debug: match {i+1}: {match}")
+
+                # write the matches, skipping the text formatting entirely.
+                # audio rows carry every context word, so only the matches
+                # are written, each with its context joined into text
+                if args.json:
+                    audio_records = audio_match_records(audio_results, args.context)
+                    for source, items in (('audio', audio_records), ('screen', screen_results)):
+                        for item in items:
+                            write(json.dumps({'source': source, **item}, default=str))
+                            write("\n")
+                    return
+
+                # display audio results, writing each line as it is formatted
+                print("\naudio matches:")
+                for line in format_audio_lines(audio_results, args.context, args.utc):
+                    write(line)
+                    write("\n")
+
+                # display screen results
+                print("\nscreen matches:")
+                for line in format_screen_lines(screen_results, args.utc, db):
+                    write(line)
+                    write("\n")
+
+        except FileNotFoundError as e:
+            print(f"error: {e}", file=sys.stderr)
+            print("check your DB_PATH setting in .env file", file=sys.stderr)
+            sys.exit(1)
+        except ConnectionError as e:
+            print(f"error: {e}", file=sys.stderr)
+            print("check your DB_PASSWORD setting in .env file", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            print(f"unexpected error: {e}", file=sys.stderr)
+            print(f"error type: {type(e).__name__}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -151,7 +151,8 @@ def display_stats(stats, relative_time=None, use_utc=False):
     # database overview
     if db_stats['db_size_mb'] > 0:
         print("\n📊 DATABASE OVERVIEW")
-        print(f"Database Size: {db_stats['db_size_mb']} MB")
+        size_note = " (includes the transcript search index)" if db_stats.get('db_size_includes_fts') else ""
+        print(f"Database Size: {db_stats['db_size_mb']} MB{size_note}")
         print(f"Number of Tables: {db_stats['table_count']}")
     # Skip database overview section for relative time queries
     print("\nData Types Explanation:")